@@ -0,0 +1,113 @@
+# client_pool.py
+# Compares A2AClient calls that open a new connection per request (the old
+# behaviour) with calls over the client's shared keep-alive pool, against a
+# local echo server started in a subprocess.
+#
+#   python -m benchmarks.client_pool --calls 500 --concurrency 32
+import argparse
+import asyncio
+import logging
+import subprocess
+import sys
+import time
+from uuid import uuid4
+
+import httpx
+
+from common.client import A2AClient
+from common.types import Message, TextPart
+
+
+def serve(port: int):
+    import uvicorn
+    from common.server import A2AServer
+    from echo_server import ECHO_AGENT_CARD, EchoTaskManager
+
+    logging.disable(logging.INFO)
+    server = A2AServer(agent_card=ECHO_AGENT_CARD, task_manager=EchoTaskManager())
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def payload() -> dict:
+    return {
+        "id": uuid4().hex,
+        "message": Message(role="user", parts=[TextPart(text="ping")]),
+    }
+
+
+async def per_call_connection(url: str):
+    async with httpx.AsyncClient() as http_client:
+        async with A2AClient(url=url, http_client=http_client) as client:
+            await client.send_task(payload())
+
+
+async def run_sequential(call, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    return calls / (time.perf_counter() - start)
+
+
+async def run_concurrent(call, calls: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(calls)))
+    return calls / (time.perf_counter() - start)
+
+
+async def wait_for_server(url: str):
+    async with httpx.AsyncClient() as http_client:
+        for _ in range(100):
+            try:
+                await http_client.get(url.rsplit("/", 1)[0] + "/.well-known/agent.json")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("Echo server did not start")
+
+
+async def main(args: argparse.Namespace):
+    url = f"http://127.0.0.1:{args.port}/"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.client_pool", "--serve", "--port", str(args.port)]
+    )
+    try:
+        await wait_for_server(url)
+        async with A2AClient(url=url, http2=args.http2) as pooled:
+            pooled_call = lambda: pooled.send_task(payload())
+            fresh_call = lambda: per_call_connection(url)
+
+            print(f"{'mode':<12} {'new conn/call':>14} {'pooled':>10}")
+            sequential = [
+                await run_sequential(fresh_call, args.calls),
+                await run_sequential(pooled_call, args.calls),
+            ]
+            print(f"{'sequential':<12} {sequential[0]:>10.0f}/s {sequential[1]:>8.0f}/s")
+            concurrent = [
+                await run_concurrent(fresh_call, args.calls, args.concurrency),
+                await run_concurrent(pooled_call, args.calls, args.concurrency),
+            ]
+            print(f"{'concurrent':<12} {concurrent[0]:>10.0f}/s {concurrent[1]:>8.0f}/s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A2AClient connection pooling benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--http2", action="store_true", help="needs h2 and an HTTP/2 server")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+    else:
+        asyncio.run(main(args))
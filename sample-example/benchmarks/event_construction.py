@@ -0,0 +1,134 @@
+# event_construction.py
+# Measures streaming events/sec for wrapping an event in a
+# SendTaskStreamingResponse, for building a status update event end to end,
+# and for also framing it for SSE: fully validated pydantic constructors with
+# sse_starlette framing (the previous path) against the trusted constructors
+# and A2AServer's own framing.
+#
+#   python -m benchmarks.event_construction --events 50000
+import argparse
+import asyncio
+import time
+
+from sse_starlette.sse import ensure_bytes
+
+from common.server import A2AServer
+from common.types import (
+    Message,
+    SendTaskStreamingResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+    trusted_status_update,
+    trusted_streaming_response,
+)
+
+
+def validated_events(count: int):
+    for i in range(count):
+        status = TaskStatus(
+            state=TaskState.WORKING,
+            message=Message(role="agent", parts=[TextPart(text=f"chunk {i}")]),
+        )
+        event = TaskStatusUpdateEvent(id="bench-task", status=status)
+        response = SendTaskStreamingResponse(id="request", result=event)
+        response._event_id = i
+        yield response
+
+
+def trusted_events(count: int):
+    for i in range(count):
+        status = TaskStatus(
+            state=TaskState.WORKING,
+            message=Message(role="agent", parts=[TextPart(text=f"chunk {i}")]),
+        )
+        event = trusted_status_update("bench-task", status)
+        response = trusted_streaming_response("request", result=event)
+        response._event_id = i
+        yield response
+
+
+async def frame_validated(responses) -> int:
+    # A2AServer's event generator before trusted construction was added.
+    async def source():
+        for response in responses:
+            yield response
+
+    async def event_generator(result):
+        async for item in result:
+            event = {"data": item.model_dump_json(exclude_none=True)}
+            event["id"] = str(item._event_id)
+            yield event
+
+    total = 0
+    async for chunk in event_generator(source()):
+        total += len(ensure_bytes(chunk, "\r\n"))
+    return total
+
+
+async def frame_with_server(server: A2AServer, responses) -> int:
+    async def source():
+        for response in responses:
+            yield response
+
+    stream = server._create_response(source())
+    total = 0
+    async for chunk in stream.body_iterator:
+        total += len(ensure_bytes(chunk, "\r\n"))
+    return total
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>10.0f} events/s"
+
+
+def best_of(repeat: int, run) -> float:
+    # The minimum is the least noisy estimate on a shared machine.
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming event construction benchmark")
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    server = A2AServer()
+    n = args.events
+
+    def drain(iterable):
+        for _ in iterable:
+            pass
+
+    # What dequeue_events_for_sse does per subscriber: wrap an existing event.
+    event = next(validated_events(1)).result
+    validated_wrap = best_of(
+        args.repeat,
+        lambda: [SendTaskStreamingResponse(id="request", result=event) for _ in range(n)],
+    )
+    trusted_wrap = best_of(
+        args.repeat,
+        lambda: [trusted_streaming_response("request", result=event) for _ in range(n)],
+    )
+    validated_build = best_of(args.repeat, lambda: drain(validated_events(n)))
+    trusted_build = best_of(args.repeat, lambda: drain(trusted_events(n)))
+    validated_total = best_of(
+        args.repeat, lambda: asyncio.run(frame_validated(validated_events(n)))
+    )
+    trusted_total = best_of(
+        args.repeat, lambda: asyncio.run(frame_with_server(server, trusted_events(n)))
+    )
+
+    print(f"{'':<22} {'validated':>17} {'trusted':>17}")
+    print(f"{'wrap event':<22} {rate(n, validated_wrap)} {rate(n, trusted_wrap)}")
+    print(f"{'build':<22} {rate(n, validated_build)} {rate(n, trusted_build)}")
+    print(f"{'build + SSE framing':<22} {rate(n, validated_total)} {rate(n, trusted_total)}")
+
+
+if __name__ == "__main__":
+    main()
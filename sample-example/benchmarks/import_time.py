@@ -0,0 +1,105 @@
+# import_time.py
+# Startup cost of each entry point: imports it in a fresh interpreter with
+# -X importtime and reports its cumulative import time (best of --repeat)
+# and the modules that cost the most on their own.
+#
+#   python -m benchmarks.import_time
+#   python -m benchmarks.import_time --cwd ../travel_assistent agents.flight_agent.__main__
+#   python -m benchmarks.import_time --json > startup.json
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    "echo_server",
+    "streaming_echo_server",
+    "echo_client",
+    "streaming_echo_client",
+    "common.types",
+    "common.server",
+    "common.server.task_manager",
+    "common.client",
+]
+
+
+def importtime(statement: str, cwd: str) -> list[tuple[str, int, int, int]] | str:
+    """(name, depth, self us, cumulative us) per import, or the error."""
+    pythonpath = os.pathsep.join(filter(None, [cwd, os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": pythonpath},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        return error[-1] if error else f"exit status {result.returncode}"
+
+    # "import time: <self us> | <cumulative us> | <name indented by depth>"
+    imports = []
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        imports.append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return imports
+
+
+def profile(module: str, cwd: str, startup: set[str]) -> dict | str:
+    imports = importtime(f"import {module}", cwd)
+    if isinstance(imports, str):
+        return imports
+    # Modules the interpreter loads before running anything (site, .pth
+    # hooks) are not the entry point's cost.
+    own = [item for item in imports if item[0] not in startup]
+    return {
+        "total_ms": sum(cumulative for _, depth, _, cumulative in own if depth == 0) / 1000,
+        "modules": [(name, self_us) for name, _, self_us, _ in own],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-entry-point import time")
+    parser.add_argument("entry_points", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--cwd", default=".", help="directory the entry points import from")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest modules to list")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    cwd = os.path.abspath(args.cwd)
+    baseline = importtime("pass", cwd)
+    startup = {name for name, *_ in baseline} if isinstance(baseline, list) else set()
+
+    report = {}
+    for module in args.entry_points:
+        runs = [profile(module, cwd, startup) for _ in range(args.repeat)]
+        failed = next((run for run in runs if isinstance(run, str)), None)
+        if failed is not None:
+            report[module] = {"error": failed}
+            continue
+        # The minimum is the least noisy estimate on a shared machine.
+        best = min(runs, key=lambda run: run["total_ms"])
+        heaviest = sorted(best["modules"], key=lambda item: item[1], reverse=True)[: args.top]
+        report[module] = {
+            "import_ms": best["total_ms"],
+            "heaviest": {name: self_us / 1000 for name, self_us in heaviest},
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for module, result in report.items():
+        if "error" in result:
+            print(f"{module:<32} failed: {result['error']}")
+            continue
+        heaviest = ", ".join(f"{name} {ms:.1f}" for name, ms in result["heaviest"].items())
+        print(f"{module:<32} {result['import_ms']:>8.1f} ms   heaviest (self ms): {heaviest}")
+
+
+if __name__ == "__main__":
+    main()
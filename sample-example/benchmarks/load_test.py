@@ -0,0 +1,399 @@
+# load_test.py
+# End-to-end load test of A2AServer with the echo_server.py and
+# streaming_echo_server.py task managers. Closed-loop clients drive a mix of
+# tasks/send, tasks/get and tasks/sendSubscribe for a fixed duration, either
+# in-process over httpx's ASGI transport or against a uvicorn subprocess, and
+# report throughput, p50/p95/p99 latency, peak RSS and event-loop lag.
+#
+#   python -m benchmarks.load_test --transport uvicorn --concurrency 64 \
+#       --mix send=6,get=3,sendSubscribe=1 --output results.json
+#   python -m benchmarks.load_test --baseline results.json   # exit 1 on regression
+#
+# In uvicorn mode the server reports its own RSS and loop lag; in ASGI mode
+# client and server share one process and loop, so "server" covers both, and
+# calls that never suspend do not queue behind each other: use it to compare
+# per-request cost between commits, and uvicorn mode for latency under load.
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import httpx
+
+from common.client import A2AClient
+from common.types import Message, TextPart
+
+OPERATIONS = ("send", "get", "sendSubscribe")
+
+
+class LoopLagMonitor:
+    """Samples how late a periodic sleep wakes up on the running loop."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def reset(self):
+        self.samples = []
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.perf_counter() - start - self.interval, 0.0))
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "samples": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        }
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    # Nearest rank on an already sorted list.
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def process_stats(monitor: LoopLagMonitor) -> dict:
+    return {"peak_rss_bytes": peak_rss_bytes(), "loop_lag": monitor.snapshot()}
+
+
+def build_app(stream_delay: float):
+    """Both echo agents behind one ASGI app, at /echo/a2a and /streaming/a2a."""
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Mount, Route
+
+    from common.server import A2AServer
+    from echo_server import ECHO_AGENT_CARD, EchoTaskManager
+    from streaming_echo_server import STREAMING_ECHO_AGENT_CARD, StreamingEchoTaskManager
+
+    echo = A2AServer(
+        endpoint="/a2a", agent_card=ECHO_AGENT_CARD, task_manager=EchoTaskManager()
+    )
+    streaming = A2AServer(
+        endpoint="/a2a",
+        agent_card=STREAMING_ECHO_AGENT_CARD,
+        task_manager=StreamingEchoTaskManager(work_delay=stream_delay),
+    )
+    monitor = LoopLagMonitor()
+
+    def stats(request):
+        return JSONResponse(process_stats(monitor))
+
+    def reset(request):
+        monitor.reset()
+        return JSONResponse({})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        monitor.start()
+        yield
+        await monitor.stop()
+
+    app = Starlette(
+        routes=[
+            Route("/_bench/stats", stats, methods=["GET"]),
+            Route("/_bench/reset", reset, methods=["POST"]),
+            Mount("/echo", echo.app),
+            Mount("/streaming", streaming.app),
+        ],
+        lifespan=lifespan,
+    )
+    return app, monitor
+
+
+def serve(port: int, stream_delay: float):
+    import uvicorn
+
+    app, _ = build_app(stream_delay)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}"
+            )
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+
+def payload(task_id: str | None = None) -> dict:
+    return {
+        "id": task_id or uuid4().hex,
+        "message": Message(role="user", parts=[TextPart(text="ping")]),
+    }
+
+
+class LoadGenerator:
+    def __init__(self, echo: A2AClient, streaming: A2AClient, mix: dict[str, float]):
+        self.echo = echo
+        self.streaming = streaming
+        self.operations = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.operations]
+        # Recent task ids for tasks/get to look up.
+        self.known_ids: deque[str] = deque(maxlen=1000)
+        self.latencies: dict[str, list[float]] = {name: [] for name in self.operations}
+        self.errors: dict[str, int] = {name: 0 for name in self.operations}
+
+    async def seed(self, count: int):
+        for _ in range(count):
+            await self.send()
+
+    async def send(self) -> bool:
+        task_id = uuid4().hex
+        response = await self.echo.send_task(payload(task_id))
+        self.known_ids.append(task_id)
+        return response.error is None
+
+    async def get(self) -> bool:
+        response = await self.echo.get_task({"id": random.choice(self.known_ids)})
+        return response.error is None
+
+    async def send_subscribe(self) -> bool:
+        final = False
+        async for response in self.streaming.send_task_streaming(payload()):
+            if response.error is not None:
+                return False
+            final = getattr(response.result, "final", False)
+        return final
+
+    async def worker(self, deadline: float):
+        calls = {"send": self.send, "get": self.get, "sendSubscribe": self.send_subscribe}
+        while time.perf_counter() < deadline:
+            name = random.choices(self.operations, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = await calls[name]()
+            except Exception:
+                ok = False
+            if ok:
+                self.latencies[name].append(time.perf_counter() - start)
+            else:
+                self.errors[name] += 1
+            # Over the ASGI transport a call may finish without suspending;
+            # yield so workers interleave as they would over sockets.
+            await asyncio.sleep(0)
+
+    async def run(self, concurrency: int, duration: float) -> float:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> dict:
+        operations = {}
+        for name in self.operations:
+            ordered = sorted(self.latencies[name])
+            operations[name] = {
+                "count": len(ordered),
+                "errors": self.errors[name],
+                "throughput": len(ordered) / elapsed,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+            }
+        completed = sum(op["count"] for op in operations.values())
+        return {
+            "elapsed_s": elapsed,
+            "throughput": completed / elapsed,
+            "errors": sum(self.errors.values()),
+            "operations": operations,
+        }
+
+
+async def wait_for_server(http_client: httpx.AsyncClient, base_url: str):
+    for _ in range(100):
+        try:
+            await http_client.get(base_url + "/echo/.well-known/agent.json")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Benchmark server did not start")
+
+
+async def drive(args: argparse.Namespace, http_client: httpx.AsyncClient, base_url: str) -> dict:
+    echo = A2AClient(url=base_url + "/echo/a2a", http_client=http_client)
+    streaming = A2AClient(url=base_url + "/streaming/a2a", http_client=http_client)
+    generator = LoadGenerator(echo, streaming, args.mix)
+    await generator.seed(args.seed_tasks)
+    if args.warmup > 0:
+        await generator.run(args.concurrency, args.warmup)
+        generator = LoadGenerator(echo, streaming, args.mix)
+        await generator.seed(args.seed_tasks)
+    await http_client.post(base_url + "/_bench/reset")
+    return generator.report(await generator.run(args.concurrency, args.duration))
+
+
+async def run_asgi(args: argparse.Namespace) -> dict:
+    app, monitor = build_app(args.stream_delay)
+    # ASGITransport does not run lifespans; the monitor runs on this loop.
+    monitor.start()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, timeout=None) as http_client:
+            results = await drive(args, http_client, "http://bench")
+    finally:
+        await monitor.stop()
+    results["server"] = process_stats(monitor)
+    return results
+
+
+async def run_uvicorn(args: argparse.Namespace) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.load_test", "--serve",
+            "--port", str(args.port), "--stream-delay", str(args.stream_delay),
+        ]
+    )
+    monitor = LoopLagMonitor()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(limits=limits, timeout=None) as http_client:
+            await wait_for_server(http_client, base_url)
+            monitor.start()
+            try:
+                results = await drive(args, http_client, base_url)
+            finally:
+                await monitor.stop()
+            results["server"] = (await http_client.get(base_url + "/_bench/stats")).json()
+    finally:
+        server.terminate()
+        server.wait()
+    results["client"] = process_stats(monitor)
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    if results["throughput"] < baseline["throughput"] * (1 - tolerance):
+        found.append(
+            f"throughput {results['throughput']:.0f}/s < baseline {baseline['throughput']:.0f}/s"
+        )
+    for name, op in results["operations"].items():
+        base = baseline["operations"].get(name)
+        if base is not None and op["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            found.append(f"{name} p99 {op['p99_ms']:.1f}ms > baseline {base['p99_ms']:.1f}ms")
+    return found
+
+
+def print_report(results: dict):
+    print(f"{'operation':<14} {'count':>7} {'errors':>6} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, op in results["operations"].items():
+        print(f"{name:<14} {op['count']:>7} {op['errors']:>6} {op['throughput']:>8.0f} "
+              f"{op['p50_ms']:>8.1f} {op['p95_ms']:>8.1f} {op['p99_ms']:>8.1f}")
+    print(f"{'total':<14} {'':>7} {results['errors']:>6} {results['throughput']:>8.0f}")
+    for role in ("server", "client"):
+        if role in results:
+            stats = results[role]
+            lag = stats["loop_lag"]
+            print(f"{role}: peak RSS {stats['peak_rss_bytes'] / 2**20:.0f} MiB, loop lag "
+                  f"mean {lag['mean_ms']:.1f}ms p99 {lag['p99_ms']:.1f}ms max {lag['max_ms']:.1f}ms")
+
+
+async def main(args: argparse.Namespace) -> int:
+    run = run_asgi if args.transport == "asgi" else run_uvicorn
+    results = await run(args)
+    results["config"] = {
+        "transport": args.transport,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "mix": args.mix,
+        "stream_delay_s": args.stream_delay,
+    }
+    results["environment"] = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+    }
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION: {line}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A2AServer end-to-end load test")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="uvicorn")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds first")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix("send=6,get=3,sendSubscribe=1"),
+        help="relative weights of send, get and sendSubscribe",
+    )
+    parser.add_argument(
+        "--stream-delay", type=float, default=0.0,
+        help="work_delay of the streaming echo agent (the sample uses 1s)",
+    )
+    parser.add_argument("--seed-tasks", type=int, default=100, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if args.serve:
+        serve(args.port, args.stream_delay)
+    else:
+        sys.exit(asyncio.run(main(args)))
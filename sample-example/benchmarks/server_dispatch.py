@@ -0,0 +1,136 @@
+# server_dispatch.py
+# Single-core requests/second through A2AServer's ASGI app, bypassing the
+# network so only decoding, dispatch and encoding are measured.
+#
+#   python -m benchmarks.server_dispatch --requests 20000
+import argparse
+import asyncio
+import time
+
+from common.server import A2AServer
+from common.server.task_manager import InMemoryTaskManager
+from common.server.utils import new_not_implemented_error
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    GetTaskRequest,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class BenchTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        task = await self.update_store(
+            request.params.id,
+            TaskStatus(
+                state=TaskState.COMPLETED,
+                message=Message(role="agent", parts=[TextPart(text="pong")]),
+            ),
+            None,
+        )
+        return SendTaskResponse(id=request.id, result=self.append_task_history(task, 0))
+
+    async def on_send_task_subscribe(self, request):
+        return new_not_implemented_error(request.id)
+
+
+def build_server(metrics: bool = True) -> A2AServer:
+    card = AgentCard(
+        name="Bench Agent",
+        url="http://localhost/",
+        version="0.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    return A2AServer(
+        agent_card=card,
+        task_manager=BenchTaskManager(),
+        metrics_path="/metrics" if metrics else None,
+    )
+
+
+async def call(app, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, bodies: list[bytes]) -> float:
+    start = time.perf_counter()
+    for body in bodies:
+        status = await call(app, body)
+        if status != 200:
+            raise RuntimeError(f"Unexpected status {status}")
+    return len(bodies) / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="A2AServer request dispatch benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--history", type=int, default=10, help="messages per task")
+    parser.add_argument("--no-metrics", action="store_true", help="disable /metrics recording")
+    args = parser.parse_args()
+
+    server = build_server(metrics=not args.no_metrics)
+    message = Message(role="user", parts=[TextPart(text="ping " * 20)])
+
+    send_bodies = [
+        SendTaskRequest(params={"id": f"task-{i % 100}", "message": message})
+        .model_dump_json()
+        .encode()
+        for i in range(args.requests)
+    ]
+    for _ in range(args.history):
+        for body in send_bodies[:100]:
+            await call(server.app, body)
+
+    get_bodies = [
+        GetTaskRequest(params={"id": f"task-{i % 100}", "historyLength": args.history})
+        .model_dump_json()
+        .encode()
+        for i in range(args.requests)
+    ]
+
+    print(f"tasks/send  {await measure(server.app, send_bodies):>10.0f} req/s")
+    print(f"tasks/get   {await measure(server.app, get_bodies):>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+# task_manager_contention.py
+# Measures InMemoryTaskManager throughput as the number of concurrently active
+# tasks grows, comparing the global lock with per-task lock striping.
+#
+#   python -m benchmarks.task_manager_contention --io-ms 1 --ops 20
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from common.server.task_manager import InMemoryTaskManager, ConcurrencyMode
+from common.types import (
+    GetTaskRequest,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from common.server.utils import new_not_implemented_error
+
+
+class BenchTaskManager(InMemoryTaskManager):
+    def __init__(self, io_delay: float, **kwargs):
+        super().__init__(**kwargs)
+        self.io_delay = io_delay
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        # Stands in for store I/O (persistence, webhooks) done while the task
+        # lock is held; with a global lock this serializes unrelated tasks.
+        async with self.task_lock(request.params.id):
+            await asyncio.sleep(self.io_delay)
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(self, request):
+        return new_not_implemented_error(request.id)
+
+
+async def drive_task(manager: InMemoryTaskManager, ops: int):
+    task_id = uuid4().hex
+    message = Message(role="user", parts=[TextPart(text="ping")])
+    for _ in range(ops):
+        await manager.on_send_task(
+            SendTaskRequest(params=TaskSendParams(id=task_id, message=message))
+        )
+        await manager.on_get_task(
+            GetTaskRequest(params=TaskQueryParams(id=task_id, historyLength=1))
+        )
+
+
+async def measure(mode: ConcurrencyMode, concurrency: int, ops: int, io_delay: float):
+    manager = BenchTaskManager(io_delay, concurrency_mode=mode)
+    start = time.perf_counter()
+    await asyncio.gather(*(drive_task(manager, ops) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return concurrency * ops * 2 / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="InMemoryTaskManager lock contention benchmark")
+    parser.add_argument("--ops", type=int, default=20, help="send+get pairs per task")
+    parser.add_argument("--io-ms", type=float, default=1.0, help="simulated I/O under the task lock")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64, 256])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6} {'global ops/s':>14} {'striped ops/s':>14} {'speedup':>8}")
+    for concurrency in args.concurrency:
+        results = {}
+        for mode in ConcurrencyMode:
+            results[mode] = await measure(mode, concurrency, args.ops, args.io_ms / 1000)
+        speedup = results[ConcurrencyMode.STRIPED] / results[ConcurrencyMode.GLOBAL_LOCK]
+        print(
+            f"{concurrency:>6} {results[ConcurrencyMode.GLOBAL_LOCK]:>14.0f} "
+            f"{results[ConcurrencyMode.STRIPED]:>14.0f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,2 +1,29 @@
-from common.client.client import A2AClient
-from common.client.card_resolver import A2ACardResolver
+# Imported lazily so that server code using common.client.policies does not
+# load httpx_sse and the rest of the client.
+import importlib
+
+_EXPORTS = {
+    "A2AClient": "common.client.client",
+    "A2ACardResolver": "common.client.card_resolver",
+    "CachingCardResolver": "common.client.card_resolver",
+    "CircuitBreaker": "common.client.policies",
+    "HedgingPolicy": "common.client.policies",
+    "LatencyHistogram": "common.client.policies",
+    "ArtifactAssembler": "common.client.artifacts",
+    "assemble_artifacts": "common.client.artifacts",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,97 @@
+from common.types import (
+    Artifact,
+    TaskArtifactUpdateEvent,
+    SendTaskStreamingResponse,
+    TextPart,
+)
+from typing import AsyncIterable
+
+
+class _PartialArtifact:
+    def __init__(self, artifact: Artifact):
+        self.artifact = artifact
+        self.parts = []
+        # Consecutive text chunks are only joined once, when the part ends.
+        self.text: list[str] = []
+        self.add(artifact)
+
+    def add(self, chunk: Artifact):
+        for part in chunk.parts:
+            if isinstance(part, TextPart) and part.metadata is None:
+                self.text.append(part.text)
+            else:
+                self._flush_text()
+                self.parts.append(part)
+        if chunk is not self.artifact:
+            for field in ("name", "description", "metadata"):
+                value = getattr(chunk, field)
+                if value is not None:
+                    setattr(self.artifact, field, value)
+        self.artifact.lastChunk = chunk.lastChunk
+
+    def _flush_text(self):
+        if self.text:
+            self.parts.append(TextPart(text="".join(self.text)))
+            self.text = []
+
+    def build(self) -> Artifact:
+        self._flush_text()
+        return self.artifact.model_copy(update={"parts": self.parts, "append": None})
+
+
+class ArtifactAssembler:
+    """Rebuilds complete artifacts from a stream of chunked artifact updates.
+
+    Chunks are grouped by (task id, ``Artifact.index``); a chunk without
+    ``append`` starts a new artifact and, as on the server, the one it
+    replaces is finished as it stands. Text is buffered and joined once, so
+    assembly is linear in the size of the artifact.
+    """
+
+    def __init__(self):
+        self._partial: dict[tuple[str, int], _PartialArtifact] = {}
+
+    def add(self, event: TaskArtifactUpdateEvent) -> list[Artifact]:
+        """Feed one update; returns the artifacts it completes, oldest first.
+
+        That is the artifact whose last chunk this is, preceded by any open
+        artifact with the same index that a non-append chunk replaced.
+        """
+        key = (event.id, event.artifact.index)
+        done = []
+        partial = self._partial.get(key)
+        if partial is None or not event.artifact.append:
+            if partial is not None:
+                done.append(partial.build())
+            partial = self._partial[key] = _PartialArtifact(
+                event.artifact.model_copy()
+            )
+        else:
+            partial.add(event.artifact)
+
+        if event.artifact.lastChunk:
+            del self._partial[key]
+            done.append(partial.build())
+        return done
+
+    def flush(self) -> list[Artifact]:
+        """Return the artifacts whose last chunk never arrived and forget them."""
+        artifacts = [partial.build() for partial in self._partial.values()]
+        self._partial.clear()
+        return artifacts
+
+
+async def assemble_artifacts(
+    responses: AsyncIterable[SendTaskStreamingResponse],
+) -> AsyncIterable[Artifact]:
+    """Yield complete artifacts from ``A2AClient.send_task_streaming`` output.
+
+    Artifacts still open when the stream ends are yielded last, as they are.
+    """
+    assembler = ArtifactAssembler()
+    async for response in responses:
+        if isinstance(response.result, TaskArtifactUpdateEvent):
+            for artifact in assembler.add(response.result):
+                yield artifact
+    for artifact in assembler.flush():
+        yield artifact
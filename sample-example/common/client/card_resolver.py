@@ -1,9 +1,16 @@
 import httpx
 from common.types import (
     AgentCard,
+    A2AClientHTTPError,
     A2AClientJSONError,
 )
+from typing import Any, Iterable
+from pathlib import Path
+import asyncio
+import hashlib
 import json
+import os
+import time
 
 
 class A2ACardResolver:
@@ -20,3 +27,148 @@ class A2ACardResolver:
             except json.JSONDecodeError as e:
                 raise A2AClientJSONError(str(e)) from e
 
+
+class CachingCardResolver:
+    """Async agent card resolver with an in-memory and optional on-disk cache.
+
+    A cached card is returned without a request for ``ttl`` seconds. After
+    that it is revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged card costs a 304 with no body. ``cache_dir`` keeps cards (and
+    their validators) across processes. Concurrent lookups of the same URL
+    share one request.
+    """
+
+    def __init__(
+        self,
+        agent_card_path: str = "/.well-known/agent.json",
+        ttl: float = 300.0,
+        cache_dir: str | os.PathLike | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        timeout: float | None = 10.0,
+    ):
+        self.agent_card_path = agent_card_path.lstrip("/")
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.timeout = timeout
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        # card URL -> {"card", "etag", "last_modified", "fetched_at"}
+        self._cache: dict[str, dict[str, Any]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        return self._http_client
+
+    async def aclose(self):
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self) -> "CachingCardResolver":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def get_agent_card(self, base_url: str) -> AgentCard:
+        url = base_url.rstrip("/") + "/" + self.agent_card_path
+        future = self._inflight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._resolve(url))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # Shielded so one cancelled caller does not fail the others.
+        return await asyncio.shield(future)
+
+    async def get_agent_cards(
+        self, base_urls: Iterable[str], concurrency: int = 16
+    ) -> dict[str, AgentCard | Exception]:
+        """Resolve many agents at once; failures are returned, not raised."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(base_url: str) -> AgentCard | Exception:
+            async with semaphore:
+                try:
+                    return await self.get_agent_card(base_url)
+                except Exception as e:
+                    return e
+
+        base_urls = list(dict.fromkeys(base_urls))
+        cards = await asyncio.gather(*(resolve(base_url) for base_url in base_urls))
+        return dict(zip(base_urls, cards))
+
+    def invalidate(self, base_url: str):
+        url = base_url.rstrip("/") + "/" + self.agent_card_path
+        self._cache.pop(url, None)
+        if self.cache_dir is not None:
+            self._cache_path(url).unlink(missing_ok=True)
+
+    async def _resolve(self, url: str) -> AgentCard:
+        entry = self._cache.get(url)
+        if entry is None and self.cache_dir is not None:
+            entry = await asyncio.to_thread(self._load, url)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            self._cache[url] = entry
+            return entry["card"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = await self.http_client.get(url, headers=headers)
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
+
+        if response.status_code == 304 and entry is not None:
+            entry = {**entry, "fetched_at": time.time()}
+        else:
+            try:
+                response.raise_for_status()
+                card = AgentCard(**response.json())
+            except httpx.HTTPStatusError as e:
+                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+            except json.JSONDecodeError as e:
+                raise A2AClientJSONError(str(e)) from e
+            entry = {
+                "card": card,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "fetched_at": time.time(),
+            }
+
+        self._cache[url] = entry
+        if self.cache_dir is not None:
+            await asyncio.to_thread(self._store, url, entry)
+        return entry["card"]
+
+    def _cache_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def _load(self, url: str) -> dict[str, Any] | None:
+        try:
+            data = json.loads(self._cache_path(url).read_bytes())
+            return {**data, "card": AgentCard(**data["card"])}
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # A corrupt or outdated cache file is just a cache miss.
+            return None
+
+    def _store(self, url: str, entry: dict[str, Any]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        data = {
+            **entry,
+            "url": url,
+            "card": entry["card"].model_dump(mode="json", exclude_none=True),
+        }
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
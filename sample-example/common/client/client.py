@@ -1,6 +1,7 @@
 import httpx
-from httpx_sse import connect_sse
-from typing import Any, AsyncIterable
+from httpx_sse import aconnect_sse
+from typing import Any, AsyncIterable, Iterable
+from itertools import islice
 from common.types import (
     AgentCard,
     GetTaskRequest,
@@ -18,56 +19,542 @@ from common.types import (
     A2AClientJSONError,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
+    TaskResubscriptionRequest,
+    TaskState,
+    TaskSendParams,
+    FileContent,
+    FilePart,
+    SendTaskStreamingResponseAdapter,
 )
+from pydantic import ValidationError
+from common.compression import compress
+from common import tracing
+from common.client.policies import CircuitBreaker, HedgingPolicy, LatencyHistogram
+from collections import OrderedDict
+from urllib.parse import urljoin
+import asyncio
+import base64
 import json
+import os
+import time
+
+# latency_stats() key for batched tasks/send round trips, which take longer
+# than a single request and would skew its latencies and hedging delay.
+BATCH_LATENCY_KEY = "tasks/send (batch)"
+
+# States in which wait_for_task stops waiting.
+WAIT_DONE_STATES = {
+    TaskState.COMPLETED,
+    TaskState.CANCELED,
+    TaskState.FAILED,
+    TaskState.INPUT_REQUIRED,
+}
 
 
 class A2AClient:
-    def __init__(self, agent_card: AgentCard = None, url: str = None):
+    """JSON-RPC client for one A2A agent.
+
+    Requests share one pooled ``httpx.AsyncClient`` (keep-alive, optional
+    HTTP/2), created on first use. Close it with ``aclose()`` or by using the
+    client as an async context manager. Pass ``http_client`` to share a pool
+    between several A2AClients; it is then left open on close.
+
+    Optional ``hedging_policy`` and ``circuit_breaker`` (see
+    common.client.policies) trim tail latency and fail fast on an unhealthy
+    endpoint; ``latency_stats()`` reports the per-method latencies they use.
+    """
+
+    def __init__(
+        self,
+        agent_card: AgentCard = None,
+        url: str = None,
+        task_cache_size: int = 1024,
+        http_client: httpx.AsyncClient | None = None,
+        http2: bool = False,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float | None = 30.0,
+        method_timeouts: dict[str, float | None] | None = None,
+        hedging_policy: HedgingPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        files_url: str | None = None,
+        inline_file_limit: int | None = None,
+        request_encoding: str | None = None,
+        compression_threshold: int = 1024,
+    ):
+        self.agent_card = agent_card
         if agent_card:
             self.url = agent_card.url
         elif url:
             self.url = url
         else:
             raise ValueError("Must provide either agent_card or url")
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        # Image generation could take time, so the default is generous;
+        # method_timeouts overrides it per JSON-RPC method, e.g. {"tasks/get": 5}.
+        self.timeout = timeout
+        self.method_timeouts = dict(method_timeouts or {})
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self.hedging_policy = hedging_policy
+        self.circuit_breaker = circuit_breaker
+        self.latency_histograms: dict[str, LatencyHistogram] = {}
+        # With inline_file_limit set, FileParts whose base64 payload is longer
+        # are uploaded to the server's /files endpoint and sent by uri instead.
+        # Off by default: only an A2AServer with a file_store serves /files.
+        self.files_url = files_url or urljoin(self.url, "/files")
+        self.inline_file_limit = inline_file_limit
+        # Responses are decompressed by httpx, which advertises what it can
+        # decode. Compressing requests ("gzip", "deflate" or "br") needs a
+        # server that accepts Content-Encoding, such as A2AServer.
+        self.request_encoding = request_encoding
+        self.compression_threshold = compression_threshold
+        # Last tasks/get result per (task id, historyLength) with its ETag, so
+        # polls of unchanged tasks come back as 304 with no body.
+        self.task_cache_size = task_cache_size
+        self._task_cache: OrderedDict[tuple, tuple[str, dict[str, Any]]] = OrderedDict()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            # http2=True needs the optional h2 package (pip install httpx[http2]).
+            self._http_client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits, timeout=self.timeout
+            )
+        return self._http_client
+
+    async def aclose(self):
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self) -> "A2AClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def _timeout_for(self, method: str) -> float | None:
+        return self.method_timeouts.get(method, self.timeout)
 
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
+        await self._offload_files(request.params)
         return SendTaskResponse(**await self._send_request(request))
 
+    async def send_tasks(
+        self,
+        payloads: Iterable[dict[str, Any]],
+        concurrency: int = 16,
+        batch_size: int | None = None,
+    ) -> AsyncIterable[tuple[int, SendTaskResponse | Exception]]:
+        """Submit many tasks, yielding ``(index, outcome)`` as each completes.
+
+        ``index`` is the payload's position in ``payloads``. ``outcome`` is the
+        SendTaskResponse (which may carry a JSON-RPC error) or the exception
+        raised for that payload. ``payloads`` is consumed lazily: at most
+        ``concurrency`` requests, each of up to ``batch_size`` tasks, are in
+        flight at once. ``batch_size`` defaults to 50 when the agent card
+        advertises ``batchRequests`` and to 1 (plain requests) otherwise.
+        """
+        if batch_size is None:
+            capabilities = self.agent_card.capabilities if self.agent_card else None
+            batch_size = 50 if capabilities and capabilities.batchRequests else 1
+        if concurrency < 1 or batch_size < 1:
+            raise ValueError("concurrency and batch_size must be at least 1")
+
+        items = enumerate(payloads)
+        pending: set[asyncio.Task] = set()
+        try:
+            while True:
+                while len(pending) < concurrency:
+                    chunk = list(islice(items, batch_size))
+                    if not chunk:
+                        break
+                    send = self._send_one if batch_size == 1 else self._send_batch
+                    pending.add(asyncio.ensure_future(send(chunk)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    for outcome in future.result():
+                        yield outcome
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _send_one(
+        self, chunk: list[tuple[int, dict[str, Any]]]
+    ) -> list[tuple[int, SendTaskResponse | Exception]]:
+        index, payload = chunk[0]
+        try:
+            return [(index, await self.send_task(payload))]
+        except Exception as e:
+            return [(index, e)]
+
+    async def _send_batch(
+        self, chunk: list[tuple[int, dict[str, Any]]]
+    ) -> list[tuple[int, SendTaskResponse | Exception]]:
+        outcomes = []
+        requests = {}
+        for index, payload in chunk:
+            try:
+                request = SendTaskRequest(params=payload)
+                await self._offload_files(request.params)
+            except Exception as e:
+                outcomes.append((index, e))
+                continue
+            requests[request.id] = (index, request)
+        if not requests:
+            return outcomes
+
+        try:
+            response = await self._post_content(
+                "tasks/send",
+                "[" + ",".join(r.model_dump_json() for _, r in requests.values()) + "]",
+                latency_key=BATCH_LATENCY_KEY,
+            )
+            data = self._parse_response(response)
+        except Exception as e:
+            return outcomes + [(index, e) for index, _ in requests.values()]
+
+        if isinstance(data, dict):
+            # The whole batch was rejected, e.g. for exceeding max_batch_size.
+            return outcomes + [
+                (index, SendTaskResponse(id=request.id, error=data.get("error")))
+                for index, request in requests.values()
+            ]
+        for item in data:
+            entry = requests.pop(item.get("id") if isinstance(item, dict) else None, None)
+            if entry is None:
+                continue
+            try:
+                outcomes.append((entry[0], SendTaskResponse(**item)))
+            except ValidationError as e:
+                outcomes.append((entry[0], A2AClientJSONError(str(e))))
+        outcomes.extend(
+            (index, A2AClientJSONError(f"No response for request {request.id}"))
+            for index, request in requests.values()
+        )
+        return outcomes
+
     async def send_task_streaming(
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """Yield the task's events; each carries its SSE id as ``_event_id``.
+
+        Pass the last ``_event_id`` received as ``lastEventId`` to
+        ``resubscribe`` to pick up where a dropped stream left off.
+        """
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, "POST", self.url, json=request.model_dump()
-            ) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.RequestError as e:
-                    raise A2AClientHTTPError(400, str(e)) from e
-
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                # Image generation could take time, adding timeout
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=30
+        await self._offload_files(request.params)
+        async for response in self._stream(request):
+            yield response
+
+    async def upload_file(
+        self,
+        content: bytes | AsyncIterable[bytes],
+        name: str | None = None,
+        mime_type: str | None = None,
+    ) -> FileContent:
+        """Stream ``content`` to the server's file store; returns a uri reference."""
+        headers = {"Content-Type": mime_type or "application/octet-stream"}
+        if name:
+            headers["X-File-Name"] = name
+        try:
+            response = await self.http_client.post(
+                self.files_url,
+                content=content,
+                headers=headers,
+                timeout=self._timeout_for("files/upload"),
+            )
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
+        data = self._parse_response(response)
+        return FileContent(name=name, mimeType=mime_type, uri=data["uri"])
+
+    async def iter_file(
+        self, file: FileContent, chunk_size: int = 64 * 1024
+    ) -> AsyncIterable[bytes]:
+        """Yield a FilePart's content, decoding inline bytes or streaming its uri."""
+        if file.bytes is not None:
+            data = base64.b64decode(file.bytes)
+            for start in range(0, len(data), chunk_size):
+                yield data[start : start + chunk_size]
+            return
+
+        try:
+            async with self.http_client.stream(
+                "GET", file.uri, timeout=self._timeout_for("files/download")
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    self._parse_response(response)
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
+
+    async def download_file(self, file: FileContent, path: str | os.PathLike):
+        with open(path, "wb") as out:
+            async for chunk in self.iter_file(file):
+                out.write(chunk)
+
+    async def _offload_files(self, params: TaskSendParams):
+        if self.inline_file_limit is None:
+            return
+
+        def too_large(part) -> bool:
+            return (
+                isinstance(part, FilePart)
+                and part.file.bytes is not None
+                and len(part.file.bytes) > self.inline_file_limit
+            )
+
+        if not any(too_large(part) for part in params.message.parts):
+            return
+        parts = []
+        for part in params.message.parts:
+            if too_large(part):
+                file = await self.upload_file(
+                    base64.b64decode(part.file.bytes), part.file.name, part.file.mimeType
                 )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+                part = part.model_copy(update={"file": file})
+            parts.append(part)
+        # A new message, so the caller's Message object is left untouched.
+        params.message = params.message.model_copy(update={"parts": parts})
+
+    async def resubscribe(
+        self, payload: dict[str, Any]
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """Reattach to a task's event stream, after params.lastEventId if given.
+
+        ``lastEventId`` is the ``_event_id`` of the last event received.
+        """
+        request = TaskResubscriptionRequest(params=payload)
+        async for response in self._stream(request):
+            yield response
+
+    async def _stream(
+        self, request: JSONRPCRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        # The connect/write timeouts still apply, but a stream may sit idle
+        # between events for as long as the task runs, so reads never time out.
+        timeout = httpx.Timeout(self._timeout_for(request.method), read=None)
+        body, body_headers = self._encode_body(request.model_dump_json())
+        # Not made current: a generator's body may resume in another context.
+        span = tracing.start_span(
+            request.method,
+            tracing.SpanKind.CLIENT,
+            {"rpc.method": request.method, "url.full": self.url},
+        )
+        body_headers = tracing.inject(body_headers, span)
+        try:
+            # Leaving the block - normally, on break or on cancellation of the
+            # consuming task - closes the response and its pooled connection.
+            async with aconnect_sse(
+                self.http_client,
+                "POST",
+                self.url,
+                content=body,
+                headers=body_headers,
+                timeout=timeout,
+            ) as event_source:
+                async for sse in event_source.aiter_sse():
+                    response = SendTaskStreamingResponseAdapter.validate_json(sse.data)
+                    if sse.id:
+                        response._event_id = int(sse.id)
+                    yield response
+        except ValidationError as e:
+            span.record_error(e)
+            raise A2AClientJSONError(str(e)) from e
+        except httpx.RequestError as e:
+            span.record_error(e)
+            raise A2AClientHTTPError(400, str(e)) from e
+        finally:
+            span.end()
+
+    async def _send_request(
+        self, request: JSONRPCRequest, headers: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        response = await self._post(request, headers)
+        return self._parse_response(response)
+
+    async def _post(
+        self, request: JSONRPCRequest, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        wait = getattr(request.params, "waitSeconds", None)
+        return await self._post_content(
+            request.method, request.model_dump_json(), headers, long_poll=wait
+        )
+
+    async def _post_content(
+        self,
+        method: str,
+        content: str,
+        headers: dict[str, str] | None = None,
+        long_poll: float | None = None,
+        latency_key: str | None = None,
+    ) -> httpx.Response:
+        with tracing.span(
+            method,
+            tracing.SpanKind.CLIENT,
+            {"rpc.method": method, "url.full": self.url},
+        ) as span:
+            response = await self._send_content(
+                method, content, tracing.inject(headers), long_poll, latency_key
+            )
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    async def _send_content(
+        self,
+        method: str,
+        content: str,
+        headers: dict[str, str] | None = None,
+        long_poll: float | None = None,
+        latency_key: str | None = None,
+    ) -> httpx.Response:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(self.url)
+
+        latency_key = latency_key or method
+        histogram = self.latency_histograms.get(latency_key)
+        if histogram is None:
+            histogram = self.latency_histograms[latency_key] = LatencyHistogram()
+
+        timeout = self._timeout_for(method)
+        if long_poll and timeout is not None:
+            # The server may hold a long poll for up to waitSeconds.
+            timeout += long_poll
+        body, body_headers = self._encode_body(content)
+        send = lambda: self.http_client.post(
+            self.url,
+            content=body,
+            headers={**body_headers, **(headers or {})},
+            timeout=timeout,
+        )
+        start = time.perf_counter()
+        try:
+            if long_poll:
+                # Parked requests would skew latencies and trigger hedges.
+                histogram = None
+                response = await send()
+            elif self.hedging_policy is not None and method in self.hedging_policy.methods:
+                response = await self._hedged(send, self.hedging_policy.delay(histogram))
+            else:
+                response = await send()
+        except httpx.TransportError:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            raise
+        except BaseException:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release()
+            raise
+
+        if histogram is not None:
+            histogram.record(time.perf_counter() - start)
+        if self.circuit_breaker is not None:
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+        return response
+
+    async def _hedged(self, send, delay: float) -> httpx.Response:
+        first = asyncio.ensure_future(send())
+        attempts = {first}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                self.hedging_policy.hedges_sent += 1
+                attempts.add(asyncio.ensure_future(send()))
+            while True:
+                done, _ = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    attempts.discard(attempt)
+                    if attempt.exception() is None or not attempts:
+                        if attempt is not first:
+                            self.hedging_policy.hedges_won += 1
+                        return attempt.result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def latency_stats(self) -> dict[str, dict]:
+        """Per-method latency snapshot (seconds), for tuning hedging and timeouts."""
+        return {method: h.snapshot() for method, h in self.latency_histograms.items()}
+
+    def _encode_body(self, content: str) -> tuple[bytes, dict[str, str]]:
+        body = content.encode()
+        headers = {"Content-Type": "application/json"}
+        if self.request_encoding and len(body) >= self.compression_threshold:
+            body = compress(body, self.request_encoding)
+            headers["Content-Encoding"] = self.request_encoding
+        return body, headers
+
+    def _parse_response(self, response: httpx.Response) -> dict[str, Any]:
+        try:
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
-        return GetTaskResponse(**await self._send_request(request))
+        cache_key = (request.params.id, request.params.historyLength)
+        cached = self._task_cache.get(cache_key) if self.task_cache_size > 0 else None
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        response = await self._post(request, headers)
+        if response.status_code == 304 and cached:
+            self._task_cache.move_to_end(cache_key)
+            return GetTaskResponse(**{**cached[1], "id": request.id})
+
+        data = self._parse_response(response)
+        etag = response.headers.get("etag")
+        if etag and self.task_cache_size > 0 and "result" in data:
+            self._task_cache[cache_key] = (etag, data)
+            self._task_cache.move_to_end(cache_key)
+            if len(self._task_cache) > self.task_cache_size:
+                self._task_cache.popitem(last=False)
+        return GetTaskResponse(**data)
+
+    async def wait_for_task(
+        self,
+        task_id: str,
+        timeout: float | None = None,
+        poll_wait: float = 30.0,
+        history_length: int | None = None,
+    ) -> GetTaskResponse:
+        """Long-poll tasks/get until the task is final or needs input.
+
+        Each call asks the server to hold it up to ``poll_wait`` seconds for a
+        state change. Returns the last response (possibly still working) once
+        ``timeout`` expires, or at the first error.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            wait = poll_wait
+            if deadline is not None:
+                wait = max(min(wait, deadline - loop.time()), 0)
+            response = await self.get_task(
+                {"id": task_id, "historyLength": history_length, "waitSeconds": wait or None}
+            )
+            if response.error or response.result.status.state in WAIT_DONE_STATES:
+                return response
+            if deadline is not None and loop.time() >= deadline:
+                return response
 
     async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
         request = CancelTaskRequest(params=payload)
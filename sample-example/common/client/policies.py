@@ -0,0 +1,141 @@
+from common.types import A2AClientCircuitOpenError
+from bisect import bisect_left
+from enum import Enum
+import math
+import time
+
+
+class LatencyHistogram:
+    """Fixed log-spaced latency buckets; O(1) memory, cheap to record.
+
+    Bucket bounds grow by ``growth`` from ``min_latency`` up to
+    ``max_latency`` (seconds), so quantiles are accurate to that ratio.
+    """
+
+    def __init__(
+        self, min_latency: float = 0.0005, max_latency: float = 120.0, growth: float = 1.2
+    ):
+        count = math.ceil(math.log(max_latency / min_latency, growth)) + 1
+        self.bounds = [min_latency * growth**i for i in range(count)]
+        self.counts = [0] * (count + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, latency: float):
+        self.counts[bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile, None if empty."""
+        if self.count == 0:
+            return None
+        rank = math.ceil(q * self.count)
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[min(i, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                f"{bound:.4f}": bucket_count
+                for bound, bucket_count in zip(self.bounds + [math.inf], self.counts)
+                if bucket_count
+            },
+        }
+
+
+class HedgingPolicy:
+    """When to send a second copy of a slow idempotent request.
+
+    The hedge goes out once the first attempt has taken longer than the
+    method's observed ``quantile`` latency (p95 by default), clamped to
+    ``[min_delay, max_delay]``. Until ``min_samples`` calls have been
+    recorded ``initial_delay`` is used. Whichever response arrives first
+    wins and the other request is cancelled.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"tasks/get", "tasks/pushNotification/get"})
+
+    def __init__(
+        self,
+        methods: frozenset[str] = IDEMPOTENT_METHODS,
+        quantile: float = 0.95,
+        min_delay: float = 0.005,
+        max_delay: float = 2.0,
+        initial_delay: float = 0.1,
+        min_samples: int = 20,
+    ):
+        self.methods = frozenset(methods)
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def delay(self, histogram: LatencyHistogram) -> float:
+        if histogram.count < self.min_samples:
+            return self.initial_delay
+        return min(max(histogram.quantile(self.quantile), self.min_delay), self.max_delay)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive failures.
+
+    While open every call raises A2AClientCircuitOpenError. After
+    ``recovery_timeout`` seconds one trial call is let through (half-open):
+    success closes the circuit, failure opens it again. Failures are
+    transport errors, timeouts and 5xx responses. Share one breaker between
+    the clients that talk to the same endpoint.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_request(self, url: str):
+        if self.state == CircuitState.CLOSED:
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == CircuitState.OPEN and elapsed >= self.recovery_timeout:
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        raise A2AClientCircuitOpenError(url, max(self.recovery_timeout - elapsed, 0.0))
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        self.state = CircuitState.CLOSED
+
+    def release(self):
+        # A call that ended without a verdict, e.g. cancelled, frees the trial.
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
@@ -0,0 +1,141 @@
+"""Content-Encoding helpers shared by A2AServer and A2AClient.
+
+gzip and deflate come from zlib; brotli ("br") is offered only when the
+optional ``brotli`` package is installed.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+# Preference order when a client accepts several encodings equally.
+SUPPORTED_ENCODINGS = (["br"] if brotli is not None else []) + ["gzip", "deflate"]
+
+
+def _brotli_output_is_bounded() -> bool:
+    # brotli 1.2 added output_buffer_limit; older releases cannot cap how
+    # much a single call expands, so they are not used on untrusted input.
+    try:
+        brotli.Decompressor().process(b"", output_buffer_limit=1)
+    except TypeError:
+        return False
+    return True
+
+
+_BROTLI_BOUNDED = brotli is not None and _brotli_output_is_bounded()
+
+
+class UnsupportedEncodingError(ValueError):
+    pass
+
+
+class BodyTooLargeError(ValueError):
+    pass
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Pick the best supported encoding from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == "gzip":
+        return zlib.compress(data, level, wbits=31)
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=min(level, 11))
+    raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str, max_size: int | None = None) -> bytes:
+    """Decode a request body.
+
+    At most ``max_size + 1`` bytes are ever decoded, so a decompression
+    bomb is rejected with BodyTooLargeError before it is expanded.
+
+    Raises UnsupportedEncodingError for an unknown encoding, and for "br"
+    with a size limit on brotli < 1.2, which cannot bound its output.
+    Raises ValueError for a corrupt or truncated body.
+    """
+    if encoding in ("identity", ""):
+        return data
+    limit = 0 if max_size is None else max_size + 1
+    try:
+        if encoding == "br" and brotli is not None and (_BROTLI_BOUNDED or not limit):
+            decompressor = brotli.Decompressor()
+            if limit:
+                decoded = decompressor.process(data, output_buffer_limit=limit)
+            else:
+                decoded = decompressor.process(data)
+            finished = decompressor.is_finished()
+        elif encoding in ("gzip", "deflate"):
+            # wbits=47 auto-detects gzip and zlib headers.
+            decompressor = zlib.decompressobj(wbits=47)
+            decoded = decompressor.decompress(data, limit)
+            finished = decompressor.eof
+        else:
+            raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+    except zlib.error as e:
+        raise ValueError(f"Invalid {encoding} body: {e}") from e
+    except Exception as e:
+        if brotli is not None and isinstance(e, brotli.error):
+            raise ValueError(f"Invalid {encoding} body: {e}") from e
+        raise
+    if max_size is not None and len(decoded) > max_size:
+        raise BodyTooLargeError(f"Decompressed body exceeds {max_size} bytes")
+    if not finished:
+        raise ValueError(f"Invalid {encoding} body: truncated")
+    return decoded
+
+
+class StreamCompressor:
+    """Incremental compressor whose output can be decoded chunk by chunk.
+
+    Every ``compress`` call ends with a sync flush, so each SSE event reaches
+    the client as soon as it is sent while still sharing one compression
+    window with the events before it.
+    """
+
+    def __init__(self, encoding: str, level: int = 6):
+        self.encoding = encoding
+        if encoding == "br":
+            if brotli is None:
+                raise UnsupportedEncodingError("Unsupported content encoding: br")
+            self._compressor = brotli.Compressor(quality=min(level, 11))
+        elif encoding in ("gzip", "deflate"):
+            wbits = 31 if encoding == "gzip" else 15
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+        else:
+            raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
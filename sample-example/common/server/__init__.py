@@ -1,2 +1,23 @@
-from common.server.server import A2AServer
-from common.server.task_manager import TaskManager
+# A2AServer pulls in starlette, which code that only needs a task manager or
+# task store does not; submodules are imported on first attribute access.
+import importlib
+
+_EXPORTS = {
+    "A2AServer": "common.server.server",
+    "TaskManager": "common.server.task_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
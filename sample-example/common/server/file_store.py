@@ -0,0 +1,117 @@
+from typing import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+import asyncio
+import tempfile
+import threading
+import time
+import uuid
+
+# Uploads are unauthenticated, so FileStore caps them unless told otherwise.
+DEFAULT_MAX_FILE_SIZE = 100 * 1024 * 1024
+
+
+@dataclass
+class StoredFile:
+    file: tempfile.SpooledTemporaryFile
+    name: str | None
+    mime_type: str | None
+    size: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    # Downloads share the file handle; each seek and read holds this.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        with self.lock:
+            self.file.seek(offset)
+            return self.file.read(size)
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+class FileStore:
+    """Holds uploaded FilePart payloads for A2AServer's /files endpoints.
+
+    Each file is a SpooledTemporaryFile: small files stay in memory and
+    larger ones roll over to an anonymous temp file (in ``directory``), so
+    neither uploads nor downloads are ever buffered whole. Disk reads and
+    writes run in a worker thread. Uploads over ``max_file_size`` bytes
+    (100 MiB by default; ``None`` lifts the cap) are refused, and files are
+    dropped ``ttl`` seconds after upload.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        spool_max_memory: int = 1024 * 1024,
+        max_file_size: int | None = DEFAULT_MAX_FILE_SIZE,
+        ttl: float | None = 3600.0,
+        chunk_size: int = 64 * 1024,
+    ):
+        self.directory = directory
+        self.spool_max_memory = spool_max_memory
+        self.max_file_size = max_file_size
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.files: dict[str, StoredFile] = {}
+
+    async def save(
+        self,
+        chunks: AsyncIterable[bytes],
+        name: str | None = None,
+        mime_type: str | None = None,
+    ) -> str:
+        self._expire()
+        stored = StoredFile(
+            file=tempfile.SpooledTemporaryFile(
+                max_size=self.spool_max_memory, dir=self.directory
+            ),
+            name=name,
+            mime_type=mime_type,
+        )
+        try:
+            async for chunk in chunks:
+                stored.size += len(chunk)
+                if self.max_file_size is not None and stored.size > self.max_file_size:
+                    raise FileTooLargeError(
+                        f"File exceeds the {self.max_file_size} byte limit"
+                    )
+                await asyncio.to_thread(stored.file.write, chunk)
+        except BaseException:
+            stored.file.close()
+            raise
+
+        file_id = uuid.uuid4().hex
+        self.files[file_id] = stored
+        return file_id
+
+    def get(self, file_id: str) -> StoredFile | None:
+        return self.files.get(file_id)
+
+    async def read(self, file_id: str) -> AsyncIterator[bytes]:
+        stored = self.files[file_id]
+        offset = 0
+        while offset < stored.size:
+            chunk = await asyncio.to_thread(stored.read_at, offset, self.chunk_size)
+            if not chunk:
+                break
+            offset += len(chunk)
+            yield chunk
+
+    def delete(self, file_id: str):
+        stored = self.files.pop(file_id, None)
+        if stored is not None:
+            stored.file.close()
+
+    def close(self):
+        for file_id in list(self.files):
+            self.delete(file_id)
+
+    def _expire(self):
+        if self.ttl is None:
+            return
+        cutoff = time.monotonic() - self.ttl
+        for file_id, stored in list(self.files.items()):
+            if stored.created_at < cutoff:
+                self.delete(file_id)
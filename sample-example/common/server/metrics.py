@@ -0,0 +1,125 @@
+"""Server metrics rendered in the Prometheus text exposition format.
+
+Recording is a bisect and a few integer adds on a LatencyHistogram, and
+gauges are only computed when ``/metrics`` is scraped, so instrumentation
+costs next to nothing on the request path.
+"""
+from common.client.policies import LatencyHistogram
+from typing import Callable
+import asyncio
+import math
+import time
+
+
+def _histogram() -> LatencyHistogram:
+    # Half-decade buckets from 10us to 10s: lock waits and serialization sit
+    # at the low end, long-polls and slow handlers at the high end.
+    return LatencyHistogram(min_latency=1e-5, max_latency=10.0, growth=math.sqrt(10))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class HistogramFamily:
+    def __init__(self, name: str, help: str, label: str):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.series: dict[str, LatencyHistogram] = {}
+
+    def labels(self, value: str) -> LatencyHistogram:
+        histogram = self.series.get(value)
+        if histogram is None:
+            histogram = self.series[value] = _histogram()
+        return histogram
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for value, histogram in sorted(self.series.items()):
+            label = f'{self.label}="{_escape(value)}"'
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + [math.inf], histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else f"{bound:.6g}"
+                lines.append(f'{self.name}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {histogram.total!r}")
+            lines.append(f"{self.name}_count{{{label}}} {histogram.count}")
+        return lines
+
+
+class CounterFamily:
+    def __init__(self, name: str, help: str, label: str):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.series: dict[str, int] = {}
+
+    def inc(self, value: str, amount: int = 1):
+        self.series[value] = self.series.get(value, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for value, count in sorted(self.series.items()):
+            lines.append(f'{self.name}{{{self.label}="{_escape(value)}"}} {count}')
+        return lines
+
+
+class ServerMetrics:
+    """Counters and histograms for A2AServer and the task manager it serves."""
+
+    def __init__(self):
+        self.request_duration = HistogramFamily(
+            "a2a_request_duration_seconds",
+            "Time spent in the task manager per JSON-RPC method; streaming "
+            "methods are timed until their stream starts.",
+            "method",
+        )
+        self.lock_wait = HistogramFamily(
+            "a2a_lock_wait_seconds", "Time spent waiting to acquire a task manager lock.", "lock"
+        )
+        self.serialization = HistogramFamily(
+            "a2a_serialization_seconds",
+            "Time spent encoding JSON-RPC responses and SSE events.",
+            "kind",
+        )
+        self.validation_failures = CounterFamily(
+            "a2a_validation_failures_total",
+            "Requests rejected because their body was not valid JSON or JSON-RPC.",
+            "kind",
+        )
+        self._gauges: list[tuple[str, str, Callable[[], float]]] = []
+
+    def gauge(self, name: str, help: str, collect: Callable[[], float]):
+        """Register a gauge whose value is computed by ``collect`` on scrape."""
+        self._gauges = [gauge for gauge in self._gauges if gauge[0] != name]
+        self._gauges.append((name, help, collect))
+
+    def render(self) -> str:
+        lines = []
+        for family in (
+            self.request_duration,
+            self.lock_wait,
+            self.serialization,
+            self.validation_failures,
+        ):
+            lines.extend(family.render())
+        for name, help, collect in self._gauges:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {collect()!r}")
+        return "\n".join(lines) + "\n"
+
+
+class TimedLock(asyncio.Lock):
+    """An asyncio.Lock that records how long each acquire waited."""
+
+    def __init__(self, wait: LatencyHistogram):
+        super().__init__()
+        self._wait = wait
+
+    async def acquire(self):
+        start = time.perf_counter()
+        acquired = await super().acquire()
+        self._wait.record(time.perf_counter() - start)
+        return acquired
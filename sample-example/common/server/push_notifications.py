@@ -0,0 +1,172 @@
+from common.types import Task, PushNotificationConfig
+from common.client.policies import LatencyHistogram
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying; any other 4xx means the receiver rejected it.
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+class PushNotificationSender:
+    """Background delivery of task updates to push notification webhooks.
+
+    ``enqueue`` never blocks: it records the task's latest state and a pool
+    of ``workers`` POSTs it to the configured URL over one pooled HTTP
+    client. Updates for a task that arrive before its previous notification
+    went out are coalesced into one, and a task never has two deliveries in
+    flight, so receivers see its states in order. Failed deliveries are
+    retried with jittered exponential backoff; a retry is abandoned when a
+    newer update for the task is waiting.
+
+    The webhook URL comes from the client, and the server can reach
+    addresses the client cannot, internal ones included. Delivery therefore
+    needs a ``url_allowed`` policy: configs whose URL it rejects, and every
+    config while it is unset, are refused by tasks/pushNotification/set and
+    never delivered to.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        max_retries: int = 5,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        http_client: "httpx.AsyncClient | None" = None,
+        max_connections: int = 100,
+        url_allowed: Callable[[str], bool] | None = None,
+    ):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self.url_allowed = url_allowed
+        # task id -> (config, task, time of the oldest undelivered update)
+        self._pending: dict[str, tuple[PushNotificationConfig, Task, float]] = {}
+        self._in_flight: set[str] = set()
+        self._queue: asyncio.Queue[str] | None = None
+        self._workers: list[asyncio.Task] = []
+        self.stats = {"delivered": 0, "failed": 0, "retries": 0, "coalesced": 0}
+        # Seconds from the first undelivered update to a successful delivery.
+        self.latency = LatencyHistogram()
+
+    @property
+    def http_client(self) -> "httpx.AsyncClient":
+        if self._http_client is None:
+            # httpx is only imported once a notification is actually sent.
+            import httpx
+
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+        return self._http_client
+
+    def is_allowed(self, url: str) -> bool:
+        return self.url_allowed is not None and self.url_allowed(url)
+
+    def enqueue(self, task_id: str, config: PushNotificationConfig, task: Task):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+
+        previous = self._pending.get(task_id)
+        if previous is not None:
+            self.stats["coalesced"] += 1
+            self._pending[task_id] = (config, task, previous[2])
+            return
+
+        self._pending[task_id] = (config, task, time.monotonic())
+        if task_id not in self._in_flight:
+            self._queue.put_nowait(task_id)
+
+    async def drain(self):
+        """Wait until every queued notification was delivered or given up on."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _work(self):
+        while True:
+            task_id = await self._queue.get()
+            try:
+                config, task, enqueued_at = self._pending.pop(task_id)
+                self._in_flight.add(task_id)
+                await self._deliver(task_id, config, task, enqueued_at)
+            except Exception as e:
+                logger.error(f"Error while delivering push notification for {task_id}: {e}")
+            finally:
+                self._in_flight.discard(task_id)
+                # An update that arrived mid-delivery was held back to keep order.
+                if task_id in self._pending:
+                    self._queue.put_nowait(task_id)
+                self._queue.task_done()
+
+    async def _deliver(
+        self, task_id: str, config: PushNotificationConfig, task: Task, enqueued_at: float
+    ):
+        import httpx
+
+        if not self.is_allowed(config.url):
+            self.stats["failed"] += 1
+            logger.error(f"Push notification URL {config.url} is not allowed for task {task_id}")
+            return
+
+        body = task.__pydantic_serializer__.to_json(task, exclude_none=True)
+        headers = {"Content-Type": "application/json"}
+        if config.token:
+            headers["X-A2A-Notification-Token"] = config.token
+        if config.authentication and config.authentication.credentials:
+            if "bearer" in (scheme.lower() for scheme in config.authentication.schemes):
+                headers["Authorization"] = f"Bearer {config.authentication.credentials}"
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                if task_id in self._pending:
+                    # A newer state supersedes this one; deliver that instead.
+                    return
+                self.stats["retries"] += 1
+                backoff = min(self.initial_backoff * 2 ** (attempt - 1), self.max_backoff)
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+
+            try:
+                response = await self.http_client.post(config.url, content=body, headers=headers)
+            except httpx.TransportError as e:
+                logger.warning(f"Push notification to {config.url} failed: {e}")
+                continue
+
+            if response.is_success:
+                self.stats["delivered"] += 1
+                self.latency.record(time.monotonic() - enqueued_at)
+                return
+            logger.warning(
+                f"Push notification to {config.url} returned {response.status_code}"
+            )
+            if response.status_code < 500 and response.status_code not in RETRYABLE_STATUS_CODES:
+                break
+
+        self.stats["failed"] += 1
+        logger.error(f"Giving up on push notification for task {task_id}")
@@ -1,6 +1,5 @@
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
-from sse_starlette.sse import EventSourceResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.requests import Request
 from common.types import (
     A2ARequest,
@@ -16,11 +15,28 @@ from common.types import (
     AgentCard,
     TaskResubscriptionRequest,
     SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
 )
 from pydantic import ValidationError
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
+import hashlib
 import json
+import time
 from typing import AsyncIterable, Any
+from contextlib import asynccontextmanager
 from common.server.task_manager import TaskManager
+from common.server.file_store import FileStore, FileTooLargeError
+from common.server.metrics import ServerMetrics
+from common.compression import (
+    BodyTooLargeError,
+    StreamCompressor,
+    UnsupportedEncodingError,
+    compress,
+    decompress,
+    negotiate,
+)
+from common import tracing
 
 import logging
 
@@ -35,19 +51,48 @@ class A2AServer:
         endpoint="/",
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        max_batch_size: int = 100,
+        file_store: FileStore | None = None,
+        files_path: str = "/files",
+        compression_threshold: int | None = 1024,
+        max_decompressed_size: int = 64 * 1024 * 1024,
+        metrics_path: str | None = "/metrics",
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
+        self.max_batch_size = max_batch_size
         self.agent_card = agent_card
-        self.app = Starlette()
+        self._agent_card_cache = None
+        # Responses of at least compression_threshold bytes, and SSE streams,
+        # are compressed when the client accepts it; None turns this off.
+        self.compression_threshold = compression_threshold
+        self.max_decompressed_size = max_decompressed_size
+        self.app = Starlette(lifespan=self._lifespan)
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
         self.app.add_route(
             "/.well-known/agent.json", self._get_agent_card, methods=["GET"]
         )
+        # Large FilePart payloads are uploaded here and referenced by uri
+        # instead of travelling base64-encoded inside the JSON-RPC body.
+        self.file_store = file_store
+        self.files_path = files_path.rstrip("/")
+        if file_store is not None:
+            self.app.add_route(self.files_path, self._upload_file, methods=["POST"])
+            self.app.add_route(
+                self.files_path + "/{file_id}", self._download_file, methods=["GET"]
+            )
+        # Prometheus metrics for the request path and the task manager;
+        # metrics_path=None turns off both the endpoint and the recording.
+        self.metrics = ServerMetrics() if metrics_path is not None else None
+        if self.metrics is not None:
+            self.app.add_route(metrics_path, self._get_metrics, methods=["GET"])
+            instrument = getattr(task_manager, "instrument", None)
+            if instrument is not None:
+                instrument(self.metrics)
 
-    def start(self):
+    def start(self, workers: int = 1):
         if self.agent_card is None:
             raise ValueError("agent_card is not defined")
 
@@ -56,65 +101,395 @@ class A2AServer:
 
         import uvicorn
 
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        if workers <= 1:
+            uvicorn.run(self.app, host=self.host, port=self.port)
+            return
+
+        task_store = getattr(self.task_manager, "task_store", None)
+        if not getattr(task_store, "shared", False):
+            raise ValueError(
+                "Multiple workers need a task manager backed by a shared TaskStore "
+                "such as SQLiteTaskStore"
+            )
+        if self.file_store is not None:
+            # A file uploaded to one worker would be missing on the others.
+            raise ValueError(
+                "FileStore keeps files in one process, so it cannot be used with "
+                "multiple workers"
+            )
+
+        self._run_workers(workers)
+
+    def _run_workers(self, workers: int):
+        # uvicorn's own multi-worker mode re-imports the app from a string in
+        # spawned processes; forking keeps the already-built app and task
+        # manager, and every worker accepts on the one listening socket.
+        import multiprocessing
+        import signal
+        import uvicorn
+
+        config = uvicorn.Config(self.app, host=self.host, port=self.port)
+        sock = config.bind_socket()
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(
+                target=uvicorn.Server(config).run,
+                kwargs={"sockets": [sock]},
+                name=f"a2a-worker-{i}",
+            )
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        logger.info(f"Started {workers} workers on {self.host}:{self.port}")
+
+        def stop(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            stop(signal.SIGINT, None)
+            for process in processes:
+                process.join()
+        finally:
+            sock.close()
+
+    @asynccontextmanager
+    async def _lifespan(self, app: Starlette):
+        yield
+        # Durable task stores flush pending writes on close.
+        close = getattr(self.task_manager, "close", None)
+        if close is not None:
+            await close()
+        if self.file_store is not None:
+            self.file_store.close()
+        # Forked workers exit without running atexit handlers.
+        tracing.flush()
+
+    def _get_agent_card(self, request: Request) -> Response:
+        body, headers = self._encoded_agent_card()
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            not_modified = headers["ETag"] in (tag.strip() for tag in if_none_match.split(","))
+        else:
+            not_modified = self._not_modified_since(
+                request.headers.get("if-modified-since"), headers["Last-Modified"]
+            )
+        if not_modified:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
 
-    def _get_agent_card(self, request: Request) -> JSONResponse:
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+    @staticmethod
+    def _not_modified_since(if_modified_since: str | None, last_modified: str) -> bool:
+        if not if_modified_since:
+            return False
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            return False
+
+    def _encoded_agent_card(self) -> tuple[bytes, dict[str, str]]:
+        # Encoded once per card object; assigning a new agent_card re-encodes.
+        if self._agent_card_cache is None or self._agent_card_cache[0] is not self.agent_card:
+            body = self.agent_card.__pydantic_serializer__.to_json(
+                self.agent_card, exclude_none=True
+            )
+            headers = {
+                "ETag": '"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+                "Last-Modified": formatdate(usegmt=True),
+            }
+            self._agent_card_cache = (self.agent_card, body, headers)
+        return self._agent_card_cache[1], self._agent_card_cache[2]
+
+    def _get_metrics(self, request: Request) -> Response:
+        return Response(
+            self.metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    async def _upload_file(self, request: Request) -> Response:
+        try:
+            file_id = await self.file_store.save(
+                request.stream(),
+                name=request.headers.get("x-file-name"),
+                mime_type=request.headers.get("content-type"),
+            )
+        except FileTooLargeError as e:
+            return JSONResponse({"error": str(e)}, status_code=413)
+
+        stored = self.file_store.get(file_id)
+        uri = str(request.base_url).rstrip("/") + self.files_path + "/" + file_id
+        return JSONResponse({"id": file_id, "uri": uri, "size": stored.size}, status_code=201)
+
+    async def _download_file(self, request: Request) -> Response:
+        file_id = request.path_params["file_id"]
+        stored = self.file_store.get(file_id)
+        if stored is None:
+            return Response(status_code=404)
+
+        headers = {"Content-Length": str(stored.size)}
+        if stored.name:
+            headers["X-File-Name"] = stored.name
+        return StreamingResponse(
+            self.file_store.read(file_id),
+            media_type=stored.mime_type or "application/octet-stream",
+            headers=headers,
+        )
 
     async def _process_request(self, request: Request):
+        # Continues the caller's trace when it sent a traceparent header. For
+        # streaming methods the span ends when the stream starts.
+        with tracing.server_span(f"POST {self.endpoint}", request.headers):
+            response = await self._handle_request(request)
+            return self._compress_response(request, response)
+
+    async def _handle_request(self, request: Request):
         try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
-                )
-            else:
-                logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
-                raise ValueError(f"Unexpected request type: {type(request)}")
+            body = await request.body()
+            content_encoding = request.headers.get("content-encoding")
+            if content_encoding:
+                try:
+                    body = decompress(
+                        body, content_encoding.strip().lower(), self.max_decompressed_size
+                    )
+                except UnsupportedEncodingError as e:
+                    return Response(str(e), status_code=415)
+                except BodyTooLargeError as e:
+                    return Response(str(e), status_code=413)
+                except ValueError as e:
+                    return Response(str(e), status_code=400)
 
-            return self._create_response(result)
+            if body.lstrip()[:1] == b"[":
+                return await self._process_batch(request, json.loads(body))
+
+            # Validating the raw bytes skips building an intermediate dict.
+            json_rpc_request = A2ARequest.validate_json(body)
+            result = await self._dispatch(request, json_rpc_request)
+            return self._create_response(result, request)
 
         except Exception as e:
             return self._handle_exception(e)
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
+    def _compress_response(self, request: Request, response: Response) -> Response:
+        if self.compression_threshold is None or "content-encoding" in response.headers:
+            return response
+        encoding = negotiate(request.headers.get("accept-encoding"))
+        if encoding is None:
+            return response
+
+        if response.media_type == "text/event-stream":
+            return _CompressedStream(response, encoding)
+        if len(response.body) < self.compression_threshold:
+            return response
+
+        headers = dict(response.headers)
+        headers["content-encoding"] = encoding
+        headers["vary"] = "Accept-Encoding"
+        body = compress(response.body, encoding)
+        headers["content-length"] = str(len(body))
+        return Response(body, status_code=response.status_code, headers=headers)
+
+    async def _process_batch(self, request: Request, body: list) -> Response:
+        if not body or len(body) > self.max_batch_size:
+            error = InvalidRequestError(
+                message=f"Batch must contain between 1 and {self.max_batch_size} requests"
+            )
+            return self._json_response(JSONRPCResponse(id=None, error=error), status_code=400)
+
+        responses = await asyncio.gather(
+            *(self._process_batch_entry(request, entry) for entry in body)
+        )
+        with tracing.span("serialize", attributes={"a2a.batch_size": len(responses)}):
+            content = b"[" + b",".join(self._encode(response) for response in responses) + b"]"
+        return Response(content, media_type="application/json")
+
+    async def _process_batch_entry(self, request: Request, entry: Any) -> JSONRPCResponse:
+        try:
+            json_rpc_request = A2ARequest.validate_python(entry)
+        except ValidationError as e:
+            if self.metrics is not None:
+                self.metrics.validation_failures.inc("request")
+            request_id = entry.get("id") if isinstance(entry, dict) else None
+            return JSONRPCResponse(
+                id=request_id, error=InvalidRequestError(data=json.loads(e.json()))
+            )
+
+        if isinstance(json_rpc_request, (SendTaskStreamingRequest, TaskResubscriptionRequest)):
+            return JSONRPCResponse(
+                id=json_rpc_request.id,
+                error=InvalidRequestError(message="Streaming methods cannot be batched"),
+            )
+
+        try:
+            result = await self._dispatch(request, json_rpc_request)
+        except Exception as e:
+            logger.error(f"Unhandled exception in batch entry {json_rpc_request.id}: {e}")
+            return JSONRPCResponse(id=json_rpc_request.id, error=InternalError())
+
+        if not isinstance(result, JSONRPCResponse):
+            logger.error(f"Unexpected result type in batch: {type(result)}")
+            return JSONRPCResponse(id=json_rpc_request.id, error=InternalError())
+        return result
+
+    # Request type -> TaskManager method. Looked up by name on every call so a
+    # task_manager assigned after construction is still honoured.
+    REQUEST_HANDLERS = {
+        GetTaskRequest: "on_get_task",
+        SendTaskRequest: "on_send_task",
+        SendTaskStreamingRequest: "on_send_task_subscribe",
+        CancelTaskRequest: "on_cancel_task",
+        SetTaskPushNotificationRequest: "on_set_task_push_notification",
+        GetTaskPushNotificationRequest: "on_get_task_push_notification",
+        TaskResubscriptionRequest: "on_resubscribe_to_task",
+    }
+
+    async def _dispatch(self, request: Request, json_rpc_request: Any) -> Any:
+        handler_name = self.REQUEST_HANDLERS.get(type(json_rpc_request))
+        if handler_name is None:
+            logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
+            raise ValueError(f"Unexpected request type: {type(json_rpc_request)}")
+
+        if handler_name == "on_resubscribe_to_task":
+            self._apply_last_event_id(request, json_rpc_request)
+
+        handler = getattr(self.task_manager, handler_name)
+        with tracing.span(
+            f"dispatch {json_rpc_request.method}",
+            attributes={"rpc.method": json_rpc_request.method},
+        ):
+            if self.metrics is None:
+                return await handler(json_rpc_request)
+            start = time.perf_counter()
+            try:
+                return await handler(json_rpc_request)
+            finally:
+                self.metrics.request_duration.labels(json_rpc_request.method).record(
+                    time.perf_counter() - start
+                )
+
+    def _apply_last_event_id(self, request: Request, json_rpc_request: TaskResubscriptionRequest):
+        # Reconnecting SSE clients send Last-Event-ID; an explicit
+        # params.lastEventId takes precedence.
+        last_event_id = request.headers.get("last-event-id")
+        if json_rpc_request.params.lastEventId is None and last_event_id:
+            try:
+                json_rpc_request.params.lastEventId = int(last_event_id)
+            except ValueError:
+                logger.warning(f"Ignoring malformed Last-Event-ID header: {last_event_id}")
+
+    def _handle_exception(self, e: Exception) -> Response:
         if isinstance(e, json.decoder.JSONDecodeError):
             json_rpc_error = JSONParseError()
         elif isinstance(e, ValidationError):
-            json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                json_rpc_error = JSONParseError()
+            else:
+                json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
         else:
             logger.error(f"Unhandled exception: {e}")
             json_rpc_error = InternalError()
 
+        if self.metrics is not None and not isinstance(json_rpc_error, InternalError):
+            kind = "json" if isinstance(json_rpc_error, JSONParseError) else "request"
+            self.metrics.validation_failures.inc(kind)
+
         response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(response.model_dump(exclude_none=True), status_code=400)
+        return self._json_response(response, status_code=400)
+
+    def _encode(self, response: JSONRPCResponse) -> bytes:
+        if self.metrics is None:
+            return self._encode_response(response)
+        start = time.perf_counter()
+        encoded = self._encode_response(response)
+        kind = "event" if isinstance(response, SendTaskStreamingResponse) else "response"
+        self.metrics.serialization.labels(kind).record(time.perf_counter() - start)
+        return encoded
+
+    def _encode_response(self, response: JSONRPCResponse) -> bytes:
+        result_json = getattr(response, "_result_json", None)
+        if result_json is not None and response.error is None:
+            # Splice the task manager's cached result bytes into the envelope.
+            envelope = b'{"jsonrpc":"2.0",'
+            if response.id is not None:
+                envelope += b'"id":' + json.dumps(response.id).encode() + b","
+            return envelope + b'"result":' + result_json + b"}"
 
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
+        # Same output as model_dump_json, but as bytes without a str round trip.
+        return response.__pydantic_serializer__.to_json(response, exclude_none=True)
+
+    def _json_response(self, response: JSONRPCResponse, status_code: int = 200) -> Response:
+        with tracing.span("serialize"):
+            content = self._encode(response)
+        return Response(content, status_code=status_code, media_type="application/json")
+
+    def _create_response(
+        self, result: Any, request: Request | None = None
+    ) -> Response:
         if isinstance(result, AsyncIterable):
+            # sse_starlette imports uvicorn; load it with the first stream.
+            from sse_starlette.sse import EventSourceResponse
 
-            async def event_generator(result) -> AsyncIterable[dict[str, str]]:
+            async def event_generator(result) -> AsyncIterable[bytes]:
+                # Events are framed here rather than by sse_starlette: compact
+                # JSON never contains a newline, so each is a single data line.
                 async for item in result:
-                    yield {"data": item.model_dump_json(exclude_none=True)}
+                    event_id = getattr(item, "_event_id", None)
+                    if event_id is not None:
+                        yield b"id: %d\r\ndata: %s\r\n\r\n" % (event_id, self._encode(item))
+                    else:
+                        yield b"data: " + self._encode(item) + b"\r\n\r\n"
 
             return EventSourceResponse(event_generator(result))
         elif isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            etag = getattr(result, "_etag", None)
+            if etag is None:
+                return self._json_response(result)
+
+            if_none_match = request.headers.get("if-none-match", "") if request else ""
+            if etag in (tag.strip() for tag in if_none_match.split(",")):
+                return Response(status_code=304, headers={"ETag": etag})
+
+            response = self._json_response(result)
+            response.headers["ETag"] = etag
+            return response
         else:
             logger.error(f"Unexpected result type: {type(result)}")
-            raise ValueError(f"Unexpected result type: {type(result)}")
\ No newline at end of file
+            raise ValueError(f"Unexpected result type: {type(result)}")
+
+
+class _CompressedStream:
+    """Wraps a streaming response, compressing and flushing each body chunk.
+
+    sse_starlette sends one body message per event, so every event is
+    flushed to the client as soon as it is produced.
+    """
+
+    def __init__(self, response: Response, encoding: str):
+        self.response = response
+        self.encoding = encoding
+
+    async def __call__(self, scope, receive, send):
+        compressor = StreamCompressor(self.encoding)
+
+        async def compressed_send(message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"content-length"
+                ]
+                headers.append((b"content-encoding", self.encoding.encode()))
+                headers.append((b"vary", b"Accept-Encoding"))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                body = compressor.compress(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body += compressor.finish()
+                message = {**message, "body": body}
+            await send(message)
+
+        await self.response(scope, receive, compressed_send)
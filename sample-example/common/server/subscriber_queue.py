@@ -0,0 +1,88 @@
+from enum import Enum
+from typing import Any
+from common.types import TaskStatusUpdateEvent, InternalError
+import asyncio
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class SubscriberQueue(asyncio.Queue):
+    """Bounded SSE subscriber queue whose publisher side never blocks.
+
+    Items are ``(event_id, event)`` pairs; ``event_id`` is None for events
+    that are not retained for replay, such as errors.
+
+    When the queue is full ``offer`` applies the overflow policy:
+
+    * ``DROP_OLDEST`` discards the oldest queued event.
+    * ``COALESCE`` discards non-final status updates that a newer status
+      update supersedes; if that frees nothing the subscriber is disconnected.
+    * ``DISCONNECT`` drops everything queued and hands the consumer an error
+      so its stream ends and the client can resubscribe.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DISCONNECT,
+    ):
+        super().__init__(maxsize)
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.dropped = 0
+        self.disconnected = False
+
+    def offer(self, item: tuple[int | None, Any]) -> bool:
+        """Enqueue without waiting; returns False if the item was not delivered."""
+        if self.disconnected:
+            return False
+
+        if not self.full():
+            self.put_nowait(item)
+            return True
+
+        if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+            self.get_nowait()
+            self.dropped += 1
+            self.put_nowait(item)
+            return True
+
+        if self.overflow_policy == OverflowPolicy.COALESCE and self._coalesce(item[1]):
+            self.put_nowait(item)
+            return True
+
+        self.disconnect()
+        return False
+
+    def disconnect(self):
+        self.disconnected = True
+        self.dropped += self.qsize()
+        self._queue.clear()
+        self.put_nowait(
+            (None, InternalError(message="SSE subscriber fell too far behind and was disconnected"))
+        )
+
+    def _coalesce(self, incoming: Any) -> bool:
+        # Walk newest to oldest: once a status update has been seen, any older
+        # non-final status update is stale and can go.
+        superseded = isinstance(incoming, TaskStatusUpdateEvent)
+        kept = []
+        for item in reversed(self._queue):
+            event = item[1]
+            if isinstance(event, TaskStatusUpdateEvent):
+                if superseded and not event.final:
+                    continue
+                superseded = True
+            kept.append(item)
+
+        removed = len(self._queue) - len(kept)
+        if removed == 0:
+            return False
+
+        self.dropped += removed
+        self._queue.clear()
+        self._queue.extend(reversed(kept))
+        return True
@@ -3,6 +3,7 @@ from typing import Union, AsyncIterable, List
 from common.types import Task
 from common.types import (
     JSONRPCResponse,
+    Message,
     TaskIdParams,
     TaskQueryParams,
     GetTaskRequest,
@@ -27,16 +28,78 @@ from common.types import (
     Artifact,
     PushNotificationConfig,
     TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent,
     JSONRPCError,
     TaskPushNotificationConfig,
     InternalError,
+    InvalidParamsError,
+    TextPart,
+    trusted_status_update,
+    trusted_streaming_response,
 )
-from common.server.utils import new_not_implemented_error
+from common.server.task_store import TaskStore, InMemoryTaskStore, StaleTaskError
+from common.server.subscriber_queue import SubscriberQueue, OverflowPolicy
+from common.server.push_notifications import PushNotificationSender
+from common.server.metrics import ServerMetrics, TimedLock
+from common import tracing
+from collections import OrderedDict
+from enum import Enum
+from itertools import islice
 import asyncio
+import contextlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATES = {TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED}
+
+# States a long-polling tasks/get returns in at once: the task will not
+# change again until the client acts. Matches the client's WAIT_DONE_STATES.
+WAIT_DONE_STATES = TERMINAL_STATES | {TaskState.INPUT_REQUIRED}
+
+# Times a write is re-read and re-applied after another worker sharing the
+# store saved the same task first.
+STALE_WRITE_RETRIES = 5
+
+
+def compact_parts(parts: list) -> list:
+    """Join runs of metadata-free TextParts into one part each, in O(n)."""
+    compacted = []
+    run: list[str] = []
+    for part in parts:
+        if isinstance(part, TextPart) and part.metadata is None:
+            run.append(part.text)
+            continue
+        if run:
+            compacted.append(TextPart(text="".join(run)))
+            run = []
+        compacted.append(part)
+    if run:
+        compacted.append(TextPart(text="".join(run)))
+    return compacted
+
+
+def append_parts(parts: list, new_parts: list):
+    """Extend ``parts`` in place, merging metadata-free text as it arrives.
+
+    Two adjacent plain TextParts are merged whenever the newer is at least
+    half as long as the one before it, so part lengths fall geometrically:
+    a run of n streamed chunks is held in O(log n) parts, and each character
+    is copied O(log n) times.
+    """
+    for part in new_parts:
+        parts.append(part)
+        while (
+            len(parts) >= 2
+            and isinstance(parts[-1], TextPart) and parts[-1].metadata is None
+            and isinstance(parts[-2], TextPart) and parts[-2].metadata is None
+            and 2 * len(parts[-1].text) >= len(parts[-2].text)
+        ):
+            last = parts.pop()
+            parts[-1] = TextPart(text=parts[-1].text + last.text)
+
+
 class TaskManager(ABC):
     @abstractmethod
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
@@ -75,35 +138,240 @@ class TaskManager(ABC):
         pass
 
 
+class ConcurrencyMode(str, Enum):
+    GLOBAL_LOCK = "global_lock"
+    STRIPED = "striped"
+
+
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
-        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+    def __init__(
+        self,
+        concurrency_mode: ConcurrencyMode = ConcurrencyMode.GLOBAL_LOCK,
+        lock_stripes: int = 64,
+        task_store: TaskStore | None = None,
+        task_ttl: float | None = None,
+        max_tasks: int | None = None,
+        sweep_interval: float = 60.0,
+        sse_queue_size: int = 1024,
+        sse_overflow_policy: OverflowPolicy = OverflowPolicy.DISCONNECT,
+        event_poll_interval: float = 0.05,
+        max_history: int | None = None,
+        response_cache_size: int = 1024,
+        max_get_wait: float = 60.0,
+        push_sender: PushNotificationSender | None = None,
+    ):
+        self.task_store = task_store if task_store is not None else InMemoryTaskStore()
+        self.tasks: dict[str, Task] = self.task_store.tasks
+        self.push_notification_infos: dict[str, PushNotificationConfig] = (
+            self.task_store.push_notification_infos
+        )
         self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, List[asyncio.Queue]] = {}
+        self.concurrency_mode = ConcurrencyMode(concurrency_mode)
+        if self.concurrency_mode == ConcurrencyMode.STRIPED:
+            if lock_stripes < 1:
+                raise ValueError("lock_stripes must be at least 1")
+            self.task_locks = [asyncio.Lock() for _ in range(lock_stripes)]
+        else:
+            self.task_locks = [self.lock]
+        self.task_sse_subscribers: dict[str, List[SubscriberQueue]] = {}
         self.subscriber_lock = asyncio.Lock()
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = OverflowPolicy(sse_overflow_policy)
+        # With a shared store, events may be published by another process, so
+        # subscribers are fed by one follower per task that tails the store.
+        self.event_poll_interval = event_poll_interval
+        self._event_followers: dict[str, asyncio.Event] = {}
+        # The loop only keeps weak references to tasks, so followers are held
+        # here until they finish, and cancelled by close().
+        self._follower_tasks: set[asyncio.Task] = set()
+        # Long-polling tasks/get requests park on a per-task event that
+        # update_store sets; max_get_wait caps params.waitSeconds.
+        self.max_get_wait = max_get_wait
+        self._state_changed: dict[str, asyncio.Event] = {}
+        # Every update_store of a task with a push notification config is
+        # handed to the sender, which delivers it in the background. Without
+        # one, configs are only stored.
+        self.push_sender = push_sender
+
+        # Retention: terminal tasks are dropped task_ttl seconds after they
+        # finish, and the least recently used terminal tasks once more than
+        # max_tasks are stored. Tasks still in progress are never evicted.
+        self.task_ttl = task_ttl
+        self.max_tasks = max_tasks
+        self.sweep_interval = sweep_interval
+        self.max_history = max_history
+        # Serialized tasks/get results keyed by (task id, version, historyLength);
+        # a bumped version makes old entries unreachable until LRU drops them.
+        self.response_cache_size = response_cache_size
+        self._response_cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self.eviction_stats = {"expired": 0, "lru": 0, "subscriber_lists": 0}
+        self._task_access: OrderedDict[str, None] = OrderedDict()
+        self._task_finished_at: dict[str, float] = {}
+        # Tasks already in a durable or shared store count as accessed, and
+        # finished ones as finished, when this manager starts.
+        started_at = time.monotonic()
+        for task_id, state in self.task_store.stored_task_states().items():
+            self._task_access[task_id] = None
+            if state in TERMINAL_STATES:
+                self._task_finished_at[task_id] = started_at
+        self._sweeper: asyncio.Task | None = None
+        self.metrics: ServerMetrics | None = None
+
+    def instrument(self, metrics: ServerMetrics):
+        """Record lock waits and report store and SSE gauges on ``metrics``.
+
+        Swaps in timed locks, so it must be called before any request is
+        served; A2AServer does this when it is constructed.
+        """
+        if self.metrics is metrics:
+            return
+        self.metrics = metrics
+        self.lock = TimedLock(metrics.lock_wait.labels("lock"))
+        if self.concurrency_mode == ConcurrencyMode.STRIPED:
+            stripe_wait = metrics.lock_wait.labels("task_stripe")
+            self.task_locks = [TimedLock(stripe_wait) for _ in self.task_locks]
+        else:
+            self.task_locks = [self.lock]
+        self.subscriber_lock = TimedLock(metrics.lock_wait.labels("subscriber_lock"))
+
+        def queue_depths():
+            return [
+                subscriber.qsize()
+                for subscribers in self.task_sse_subscribers.values()
+                for subscriber in subscribers
+            ]
+
+        metrics.gauge(
+            "a2a_tasks_stored", "Tasks resident in this process's task store.",
+            lambda: len(self.tasks),
+        )
+        metrics.gauge(
+            "a2a_sse_subscribers", "Open SSE subscriptions.",
+            lambda: sum(len(subscribers) for subscribers in self.task_sse_subscribers.values()),
+        )
+        metrics.gauge(
+            "a2a_sse_queued_events", "Events waiting in SSE subscriber queues.",
+            lambda: sum(queue_depths()),
+        )
+        metrics.gauge(
+            "a2a_sse_queue_depth_max", "Depth of the fullest SSE subscriber queue.",
+            lambda: max(queue_depths(), default=0),
+        )
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        followers = list(self._follower_tasks)
+        for follower in followers:
+            follower.cancel()
+        await asyncio.gather(*followers, return_exceptions=True)
+        self._event_followers.clear()
+        if self.push_sender is not None:
+            await self.push_sender.close()
+        await self.task_store.close()
+
+    def task_lock(self, task_id: str) -> asyncio.Lock:
+        """Lock guarding writes to a single task.
+
+        In global mode every task shares ``self.lock``; in striped mode unrelated
+        tasks hash to independent locks so they no longer serialize each other."""
+        return self.task_locks[hash(task_id) % len(self.task_locks)]
+
+    def _read_lock(self, task_id: str):
+        # With the in-process stores a writer never suspends between mutating a
+        # task and releasing its lock (LogTaskStore only queues the log record;
+        # the commit is awaited after release), shared stores have writers
+        # mutate a copy, and readers copy what they need before yielding, so
+        # striped mode can skip locking on the read path entirely. In either mode a reader may see a write that is not on
+        # disk yet; the writer's own caller is only answered once it is.
+        if self.concurrency_mode == ConcurrencyMode.STRIPED:
+            return contextlib.nullcontext()
+        return self.task_lock(task_id)
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f"Getting task {request.params.id}")
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
+        if task_query_params.waitSeconds and self.max_get_wait > 0:
+            await self.wait_for_state_change(
+                task_query_params.id, min(task_query_params.waitSeconds, self.max_get_wait)
+            )
+
+        async with self._read_lock(task_query_params.id):
+            task = await self.task_store.get_task(task_query_params.id)
             if task is None:
                 return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+            self._touch_task(task)
 
             task_result = self.append_task_history(
                 task, task_query_params.historyLength
             )
+            version = self.task_store.get_task_version(task.id)
+
+        response = GetTaskResponse(id=request.id, result=task_result)
+        if version is not None and self.response_cache_size > 0:
+            cache_key = (task.id, version, task_query_params.historyLength)
+            result_json = self._response_cache.get(cache_key)
+            if result_json is None:
+                result_json = task_result.__pydantic_serializer__.to_json(
+                    task_result, exclude_none=True
+                )
+                self._response_cache[cache_key] = result_json
+                if len(self._response_cache) > self.response_cache_size:
+                    self._response_cache.popitem(last=False)
+            else:
+                self._response_cache.move_to_end(cache_key)
+            response._result_json = result_json
+            response._etag = f'"{version}-{task_query_params.historyLength}"'
+        return response
+
+    async def wait_for_state_change(self, task_id: str, timeout: float):
+        """Return once the task's state differs from its state on entry.
+
+        Also returns at once for missing, terminal or input-required tasks,
+        and after ``timeout`` seconds. With a shared store the update may come
+        from another process, so the store is re-read every event_poll_interval.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        initial_state = None
+        while True:
+            task = await self.task_store.get_task(task_id)
+            if task is None or task.status.state in WAIT_DONE_STATES:
+                return
+            if initial_state is None:
+                initial_state = task.status.state
+            elif task.status.state != initial_state:
+                return
 
-        return GetTaskResponse(id=request.id, result=task_result)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            # Registered only when about to wait on a task that can still
+            # change, so polls for unknown ids leave nothing behind.
+            # In-process stores read without suspending, so no update can
+            # slip in since the read; shared stores are re-read every
+            # event_poll_interval anyway.
+            changed = self._state_changed.setdefault(task_id, asyncio.Event())
+            if self.task_store.shared:
+                remaining = min(remaining, self.event_poll_interval)
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify_state_change(self, task_id: str):
+        changed = self._state_changed.pop(task_id, None)
+        if changed is not None:
+            changed.set()
 
     async def on_cancel_task(self, request: CancelTaskRequest) -> CancelTaskResponse:
         logger.info(f"Cancelling task {request.params.id}")
         task_id_params: TaskIdParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_id_params.id)
+        async with self._read_lock(task_id_params.id):
+            task = await self.task_store.get_task(task_id_params.id)
             if task is None:
                 return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
 
@@ -120,28 +388,32 @@ class InMemoryTaskManager(TaskManager):
         pass
 
     async def set_push_notification_info(self, task_id: str, notification_config: PushNotificationConfig):
-        async with self.lock:
-            task = self.tasks.get(task_id)
+        async with self.task_lock(task_id):
+            task = await self.task_store.get_task(task_id)
             if task is None:
                 raise ValueError(f"Task not found for {task_id}")
 
-            self.push_notification_infos[task_id] = notification_config
+            await self.task_store.save_push_notification_info(task_id, notification_config)
 
-        return
+        await self.task_store.commit()
     
     async def get_push_notification_info(self, task_id: str) -> PushNotificationConfig:
-        async with self.lock:
-            task = self.tasks.get(task_id)
+        async with self._read_lock(task_id):
+            task = await self.task_store.get_task(task_id)
             if task is None:
                 raise ValueError(f"Task not found for {task_id}")
 
-            return self.push_notification_infos[task_id]
+            notification_config = await self.task_store.get_push_notification_info(task_id)
+            if notification_config is None:
+                raise ValueError(f"Push notification info not found for {task_id}")
+
+            return notification_config
             
         return
     
     async def has_push_notification_info(self, task_id: str) -> bool:
-        async with self.lock:
-            return task_id in self.push_notification_infos
+        async with self._read_lock(task_id):
+            return await self.task_store.get_push_notification_info(task_id) is not None
             
 
     async def on_set_task_push_notification(
@@ -150,6 +422,14 @@ class InMemoryTaskManager(TaskManager):
         logger.info(f"Setting task push notification {request.params.id}")
         task_notification_params: TaskPushNotificationConfig = request.params
 
+        url = task_notification_params.pushNotificationConfig.url
+        if self.push_sender is not None and not self.push_sender.is_allowed(url):
+            logger.warning(f"Rejected push notification URL {url}")
+            return SetTaskPushNotificationResponse(
+                id=request.id,
+                error=InvalidParamsError(message="Push notification URL is not allowed"),
+            )
+
         try:
             await self.set_push_notification_info(task_notification_params.id, task_notification_params.pushNotificationConfig)
         except Exception as e:
@@ -184,93 +464,370 @@ class InMemoryTaskManager(TaskManager):
 
     async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
         logger.info(f"Upserting task {task_send_params.id}")
-        async with self.lock:
-            task = self.tasks.get(task_send_params.id)
-            if task is None:
-                task = Task(
-                    id=task_send_params.id,
-                    sessionId = task_send_params.sessionId,
-                    messages=[task_send_params.message],
-                    status=TaskStatus(state=TaskState.SUBMITTED),
-                    history=[task_send_params.message],
-                )
-                self.tasks[task_send_params.id] = task
-            else:
-                task.history.append(task_send_params.message)
-
+        with tracing.span(
+            "task_manager.upsert_task", attributes={"a2a.task_id": task_send_params.id}
+        ):
+            def apply(task: Task | None) -> Task:
+                if task is None:
+                    return Task(
+                        id=task_send_params.id,
+                        sessionId = task_send_params.sessionId,
+                        messages=[task_send_params.message],
+                        status=TaskStatus(state=TaskState.SUBMITTED),
+                        history=[task_send_params.message],
+                    )
+                self._append_history(task, task_send_params.message)
+                return task
+
+            async with self.task_lock(task_send_params.id):
+                task = await self._read_modify_write(task_send_params.id, apply)
+                self._touch_task(task)
+
+            await self.task_store.commit()
+            await self._enforce_max_tasks()
             return task
 
     async def on_resubscribe_to_task(
         self, request: TaskResubscriptionRequest
     ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
-        return new_not_implemented_error(request.id)
+        logger.info(f"Resubscribing to task {request.params.id}")
+        try:
+            sse_event_queue = await self.setup_sse_consumer(
+                request.params.id,
+                is_resubscribe=True,
+                last_event_id=request.params.lastEventId,
+            )
+        except ValueError:
+            return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+
+        return self.dequeue_events_for_sse(request.id, request.params.id, sse_event_queue)
 
     async def update_store(
         self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
     ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
+        with tracing.span(
+            "task_manager.update_store",
+            attributes={"a2a.task_id": task_id, "a2a.task_state": status.state.value},
+        ):
+            return await self._update_store(task_id, status, artifacts)
+
+    async def _update_store(
+        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
+    ) -> Task:
+        def apply(task: Task | None) -> Task:
+            if task is None:
                 logger.error(f"Task {task_id} not found for updating the task")
                 raise ValueError(f"Task {task_id} not found")
 
             task.status = status
 
             if status.message is not None:
-                task.history.append(status.message)
+                self._append_history(task, status.message)
 
             if artifacts is not None:
                 if task.artifacts is None:
                     task.artifacts = []
-                task.artifacts.extend(artifacts)
-
+                for artifact in artifacts:
+                    self._merge_artifact(task, artifact)
             return task
 
-    def append_task_history(self, task: Task, historyLength: int | None):
-        new_task = task.model_copy()
-        if historyLength is not None and historyLength > 0:
-            new_task.history = new_task.history[-historyLength:]
+        async with self.task_lock(task_id):
+            task = await self._read_modify_write(task_id, apply)
+            self._touch_task(task)
+            self._notify_state_change(task_id)
+
+            if self.push_sender is not None:
+                push_config = await self.task_store.get_push_notification_info(task_id)
+                if push_config is not None:
+                    self.push_sender.enqueue(task_id, push_config, task)
+
+        await self.task_store.commit()
+        return task
+
+    async def _read_modify_write(self, task_id: str, apply) -> Task:
+        """Save ``apply(stored task or None)``; the caller holds the task lock.
+
+        The lock only covers this process. With a shared store another worker
+        may save the task in between, and save_task then raises
+        StaleTaskError: the write is re-applied to a fresh read instead of
+        overwriting theirs. ``apply`` gets a copy of a shared store's cached
+        task, so readers never see a write before it is saved.
+        """
+        for attempt in range(STALE_WRITE_RETRIES + 1):
+            task = await self.task_store.get_task(task_id)
+            if task is not None and self.task_store.shared:
+                task = task.model_copy(deep=True)
+            task = apply(task)
+            try:
+                await self.task_store.save_task(task)
+                return task
+            except StaleTaskError:
+                if attempt == STALE_WRITE_RETRIES:
+                    raise
+                logger.info(f"Task {task_id} changed in another worker; retrying the write")
+
+    def _touch_task(self, task: Task):
+        self._task_access[task.id] = None
+        self._task_access.move_to_end(task.id)
+
+        if task.status.state in TERMINAL_STATES:
+            # setdefault keeps insertion order equal to finish order, which
+            # lets the sweeper stop at the first task that has not expired.
+            self._task_finished_at.setdefault(task.id, time.monotonic())
         else:
-            new_task.history = []
+            self._task_finished_at.pop(task.id, None)
+
+        if self.task_ttl is not None and self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Error while sweeping expired tasks: {e}")
+
+    async def sweep(self):
+        """Evict expired terminal tasks and drop empty subscriber lists."""
+        if self.task_ttl is not None:
+            deadline = time.monotonic() - self.task_ttl
+            expired = []
+            for task_id, finished_at in self._task_finished_at.items():
+                if finished_at > deadline:
+                    break
+                expired.append(task_id)
 
-        return new_task        
+            for task_id in expired:
+                await self.evict_task(task_id)
+                self.eviction_stats["expired"] += 1
+
+        async with self.subscriber_lock:
+            empty = [
+                task_id
+                for task_id, subscribers in self.task_sse_subscribers.items()
+                if not subscribers
+            ]
+            for task_id in empty:
+                del self.task_sse_subscribers[task_id]
+            self.eviction_stats["subscriber_lists"] += len(empty)
+
+    async def _enforce_max_tasks(self):
+        if self.max_tasks is None:
+            return
+
+        excess = len(self._task_access) - self.max_tasks
+        if excess <= 0:
+            return
+        # Only finished tasks are dropped, least recently used first: evicting
+        # a running task would fail its agent's next update_store. While more
+        # than max_tasks are in progress the cap is exceeded.
+        victims = list(
+            islice(
+                (task_id for task_id in self._task_access if task_id in self._task_finished_at),
+                excess,
+            )
+        )
+        for task_id in victims:
+            if task_id not in self._task_finished_at:
+                continue  # resumed while earlier victims were evicted
+            await self.evict_task(task_id)
+            self.eviction_stats["lru"] += 1
+
+    async def evict_task(self, task_id: str):
+        async with self.task_lock(task_id):
+            await self.task_store.delete_task(task_id)
+            self._task_access.pop(task_id, None)
+            self._task_finished_at.pop(task_id, None)
+            self._notify_state_change(task_id)
+        await self.task_store.commit()
+
+        async with self.subscriber_lock:
+            if task_id in self.task_sse_subscribers and not self.task_sse_subscribers[task_id]:
+                del self.task_sse_subscribers[task_id]
+                self.eviction_stats["subscriber_lists"] += 1
+
+    def _merge_artifact(self, task: Task, artifact: Artifact):
+        # Copied so later appends never mutate an event still queued for SSE.
+        if not artifact.append:
+            task.artifacts.append(artifact.model_copy(update={"parts": list(artifact.parts)}))
+            return
+
+        # An appended chunk continues the newest artifact with its index.
+        # Streaming agents append to the newest artifact of all, so checking
+        # the last one first keeps chunk appends amortized O(1).
+        merged = None
+        for existing in reversed(task.artifacts):
+            if existing.index == artifact.index:
+                merged = existing
+                break
+        if merged is None:
+            task.artifacts.append(artifact.model_copy(update={"parts": list(artifact.parts)}))
+            return
+
+        # Text is merged as it arrives, so a task read mid-stream holds a few
+        # parts rather than one per chunk.
+        append_parts(merged.parts, artifact.parts)
+        if artifact.name is not None:
+            merged.name = artifact.name
+        if artifact.description is not None:
+            merged.description = artifact.description
+        if artifact.metadata is not None:
+            merged.metadata = {**(merged.metadata or {}), **artifact.metadata}
+        merged.lastChunk = artifact.lastChunk
+        if merged.lastChunk:
+            merged.parts = compact_parts(merged.parts)
+
+    def _append_history(self, task: Task, message: Message):
+        if task.history is None:
+            task.history = []
+        task.history.append(message)
+
+        # Trimming only once the cap is overshot by half keeps appends
+        # amortized O(1) while retained history stays within 1.5x the cap.
+        if self.max_history is not None:
+            overflow = len(task.history) - self.max_history
+            if overflow > max(self.max_history // 2, 1):
+                del task.history[:overflow]
+
+    def append_task_history(self, task: Task, historyLength: int | None):
+        # Builds the response from the last historyLength messages only; the
+        # copy is shallow, so nothing proportional to the full history is
+        # touched. Writers only append to the history or rebind fields, so a
+        # fresh list makes it a stable snapshot; artifact parts are merged in
+        # place, so each artifact gets a copy of its (short) parts list.
+        if historyLength is not None and historyLength > 0 and task.history:
+            if self.max_history is not None:
+                historyLength = min(historyLength, self.max_history)
+            history = task.history[-historyLength:]
+        else:
+            history = []
+
+        artifacts = None
+        if task.artifacts is not None:
+            artifacts = [
+                artifact.model_copy(update={"parts": list(artifact.parts)})
+                for artifact in task.artifacts
+            ]
+        return task.model_copy(update={"history": history, "artifacts": artifacts})
+
+    async def setup_sse_consumer(
+        self, task_id: str, is_resubscribe: bool = False, last_event_id: int | None = None
+    ):
+        task = None
+        if is_resubscribe:
+            task = await self.task_store.get_task(task_id)
+            if task is None:
+                raise ValueError("Task not found for resubscription")
 
-    async def setup_sse_consumer(self, task_id: str, is_resubscribe: bool = False):
         async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                if is_resubscribe:
-                    raise ValueError("Task not found for resubscription")
-                else:
-                    self.task_sse_subscribers[task_id] = []
-
-            sse_event_queue = asyncio.Queue(maxsize=0) # <=0 is unlimited
-            self.task_sse_subscribers[task_id].append(sse_event_queue)
+            sse_event_queue = SubscriberQueue(
+                maxsize=self.sse_queue_size,  # <=0 is unlimited
+                overflow_policy=self.sse_overflow_policy,
+            )
+            self.task_sse_subscribers.setdefault(task_id, []).append(sse_event_queue)
+
+            events = []
+            if is_resubscribe or self.task_store.shared:
+                # Registered before reading the buffer, so an event published in
+                # between is seen at least once; dequeue drops the duplicate.
+                events = await self.task_store.get_events(task_id, last_event_id)
+
+            if is_resubscribe:
+                replayed_final = False
+                for event_id, event in events:
+                    sse_event_queue.offer((event_id, event))
+                    replayed_final = isinstance(event, TaskStatusUpdateEvent) and event.final
+
+                if not replayed_final and task.status.state in TERMINAL_STATES:
+                    final_event = trusted_status_update(task_id, task.status, final=True)
+                    sse_event_queue.offer((None, final_event))
+
+            if self.task_store.shared and task_id not in self._event_followers:
+                cursor = events[-1][0] if events else (last_event_id or 0)
+                self._event_followers[task_id] = asyncio.Event()
+                follower = asyncio.create_task(self._follow_events(task_id, cursor))
+                self._follower_tasks.add(follower)
+                follower.add_done_callback(self._follower_tasks.discard)
+
             return sse_event_queue
 
+    async def _follow_events(self, task_id: str, cursor: int):
+        wakeup = self._event_followers[task_id]
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.event_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+
+            async with self.subscriber_lock:
+                subscribers = list(self.task_sse_subscribers.get(task_id, ()))
+                if not subscribers:
+                    del self._event_followers[task_id]
+                    return
+
+            try:
+                events = await self.task_store.get_events(task_id, cursor)
+            except Exception as e:
+                logger.error(f"Error while reading events for task {task_id}: {e}")
+                continue
+
+            for event_id, event in events:
+                cursor = event_id
+                for subscriber in subscribers:
+                    if not subscriber.disconnected and not subscriber.offer((event_id, event)):
+                        logger.warning(f"Disconnected slow SSE subscriber on task {task_id}")
+
     async def enqueue_events_for_sse(self, task_id, task_update_event):
+        event_id = None
+        if isinstance(task_update_event, (TaskStatusUpdateEvent, TaskArtifactUpdateEvent)):
+            event_id = await self.task_store.append_event(task_id, task_update_event)
+
+        if self.task_store.shared and event_id is not None:
+            # Delivered by the task's follower so every subscriber, in every
+            # worker, sees events in store order.
+            wakeup = self._event_followers.get(task_id)
+            if wakeup is not None:
+                wakeup.set()
+            return
+
         async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                return
+            current_subscribers = list(self.task_sse_subscribers.get(task_id, ()))
 
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+        # Delivery happens outside the lock and never waits on a consumer, so
+        # a slow client cannot stall publishing for other tasks or subscribers.
+        for subscriber in current_subscribers:
+            if subscriber.disconnected:
+                continue
+            if not subscriber.offer((event_id, task_update_event)):
+                logger.warning(f"Disconnected slow SSE subscriber on task {task_id}")
 
     async def dequeue_events_for_sse(
-        self, request_id, task_id, sse_event_queue: asyncio.Queue
+        self, request_id, task_id, sse_event_queue: SubscriberQueue
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        last_event_id = None
         try:
             while True:                
-                event = await sse_event_queue.get()
+                event_id, event = await sse_event_queue.get()
                 if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
+                    yield trusted_streaming_response(request_id, error=event)
                     break
-                                                
-                yield SendTaskStreamingResponse(id=request_id, result=event)
+
+                if event_id is not None:
+                    if last_event_id is not None and event_id <= last_event_id:
+                        continue
+                    last_event_id = event_id
+
+                # The event was validated when it was built; skip doing it again.
+                response = trusted_streaming_response(request_id, result=event)
+                response._event_id = event_id
+                yield response
                 if isinstance(event, TaskStatusUpdateEvent) and event.final:
                     break
         finally:
             async with self.subscriber_lock:
                 if task_id in self.task_sse_subscribers:
                     self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                    if not self.task_sse_subscribers[task_id]:
+                        del self.task_sse_subscribers[task_id]
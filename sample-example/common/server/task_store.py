@@ -0,0 +1,627 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from common.types import (
+    Task,
+    TaskState,
+    PushNotificationConfig,
+    TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent,
+)
+import asyncio
+import itertools
+import json
+import os
+import logging
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StaleTaskError(Exception):
+    """save_task lost a race: the stored task changed since it was read."""
+
+
+class TaskStore(ABC):
+    """Persistence backend for InMemoryTaskManager.
+
+    Stores expose ``tasks`` and ``push_notification_infos`` dicts holding the
+    resident working set, so subclasses that read them directly keep working.
+    Stores with ``shared = True`` may be used by several processes at once;
+    their ``save_task`` raises StaleTaskError when another process saved the
+    task after this one last read it, and the caller should re-read and retry.
+    """
+
+    shared = False
+
+    tasks: dict[str, Task]
+    push_notification_infos: dict[str, PushNotificationConfig]
+
+    @abstractmethod
+    async def get_task(self, task_id: str) -> Task | None:
+        pass
+
+    @abstractmethod
+    async def save_task(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_task(self, task_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        pass
+
+    @abstractmethod
+    async def save_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def get_task_version(self, task_id: str) -> int | None:
+        """Version of the task as last read or saved through this store.
+
+        Changes on every save_task, so it can key caches of serialized tasks."""
+        pass
+
+    @abstractmethod
+    async def append_event(self, task_id: str, event: Any) -> int:
+        """Record a streaming event for replay and return its event id."""
+        pass
+
+    @abstractmethod
+    async def get_events(
+        self, task_id: str, after_event_id: int | None = None
+    ) -> list[tuple[int, Any]]:
+        """Return retained events newer than after_event_id, oldest first."""
+        pass
+
+    def stored_task_states(self) -> dict[str, TaskState]:
+        """State of every stored task, oldest first.
+
+        Read once when a task manager starts, so tasks left by an earlier
+        process are subject to its retention limits too.
+        """
+        return {task_id: task.status.state for task_id, task in self.tasks.items()}
+
+    async def commit(self) -> None:
+        """Wait until every write made through this store so far is durable.
+
+        Writes are visible as soon as they return; stores that persist them
+        in the background finish here. InMemoryTaskManager calls this after
+        releasing the task lock, so slow storage never holds other writers.
+        """
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryTaskStore(TaskStore):
+    def __init__(self, event_buffer_size: int = 256):
+        self.tasks: dict[str, Task] = {}
+        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+        self.event_buffer_size = event_buffer_size
+        self.task_events: dict[str, deque[tuple[int, Any]]] = {}
+        self.task_versions: dict[str, int] = {}
+        # Seeded from the clock so ids and versions keep increasing across
+        # restarts: a client's Last-Event-ID or ETag never matches a value
+        # issued by a later process.
+        self._event_ids = itertools.count(time.time_ns() // 1000)
+        self._versions = itertools.count(time.time_ns() // 1000)
+
+    async def get_task(self, task_id: str) -> Task | None:
+        return self.tasks.get(task_id)
+
+    async def save_task(self, task: Task) -> None:
+        self.tasks[task.id] = task
+        self.task_versions[task.id] = next(self._versions)
+
+    async def delete_task(self, task_id: str) -> None:
+        self.tasks.pop(task_id, None)
+        self.push_notification_infos.pop(task_id, None)
+        self.task_events.pop(task_id, None)
+        self.task_versions.pop(task_id, None)
+
+    def get_task_version(self, task_id: str) -> int | None:
+        version = self.task_versions.get(task_id)
+        if version is None and task_id in self.tasks:
+            # Tasks recovered from disk get a version on first use.
+            version = self.task_versions[task_id] = next(self._versions)
+        return version
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        return self.push_notification_infos.get(task_id)
+
+    async def save_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        self.push_notification_infos[task_id] = notification_config
+
+    async def append_event(self, task_id: str, event: Any) -> int:
+        event_id = next(self._event_ids)
+        events = self.task_events.get(task_id)
+        if events is None:
+            events = self.task_events[task_id] = deque(maxlen=self.event_buffer_size)
+        events.append((event_id, event))
+        return event_id
+
+    async def get_events(
+        self, task_id: str, after_event_id: int | None = None
+    ) -> list[tuple[int, Any]]:
+        events = self.task_events.get(task_id, ())
+        if after_event_id is None:
+            return list(events)
+        return [(event_id, event) for event_id, event in events if event_id > after_event_id]
+
+
+class LogTaskStore(InMemoryTaskStore):
+    """In-memory store made durable by a snapshot file plus an append-only log.
+
+    Writes are applied to memory immediately and queued for ``wal.log``;
+    ``commit()`` waits until they are on disk. Records queued within
+    ``commit_interval`` seconds share one write and one fsync (group
+    commit). After ``snapshot_every`` log records the full state is written to
+    ``snapshot.json`` and the log is truncated, so a restart replays at most
+    that many records regardless of how many tasks exist.
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    LOG_FILE = "wal.log"
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        commit_interval: float = 0.002,
+        snapshot_every: int = 10_000,
+        fsync: bool = True,
+        event_buffer_size: int = 256,
+    ):
+        super().__init__(event_buffer_size)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.directory / self.SNAPSHOT_FILE
+        self.log_path = self.directory / self.LOG_FILE
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        # Log lines not yet written, and the future of the batch they form.
+        self._pending: list[str] = []
+        self._commit: asyncio.Future | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._io_lock = asyncio.Lock()
+        self._log_records = self._recover()
+        self._log = open(self.log_path, "a", encoding="utf-8")
+
+    async def save_task(self, task: Task) -> None:
+        await super().save_task(task)
+        self._append(
+            {"op": "task", "data": task.model_dump(mode="json", exclude_none=True)}
+        )
+
+    async def delete_task(self, task_id: str) -> None:
+        await super().delete_task(task_id)
+        self._append({"op": "delete", "id": task_id})
+
+    async def save_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        await super().save_push_notification_info(task_id, notification_config)
+        self._append(
+            {
+                "op": "push",
+                "id": task_id,
+                "data": notification_config.model_dump(mode="json", exclude_none=True),
+            }
+        )
+
+    async def commit(self) -> None:
+        if self._commit is not None:
+            # Shielded: a cancelled waiter must not cancel the batch's future.
+            await asyncio.shield(self._commit)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        self._log.close()
+
+    async def compact(self) -> None:
+        """Write a snapshot of the current state and truncate the log."""
+        async with self._io_lock:
+            # Every record already in the log was applied to memory before it
+            # was appended, so the snapshot taken here covers all of them.
+            state = json.dumps(
+                {
+                    "tasks": [
+                        task.model_dump(mode="json", exclude_none=True)
+                        for task in self.tasks.values()
+                    ],
+                    "push_notification_infos": {
+                        task_id: config.model_dump(mode="json", exclude_none=True)
+                        for task_id, config in self.push_notification_infos.items()
+                    },
+                }
+            )
+            await asyncio.to_thread(self._write_snapshot, state)
+            self._log_records = 0
+
+    def _recover(self) -> int:
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                state = json.load(f)
+            for data in state.get("tasks", []):
+                self._apply({"op": "task", "data": data})
+            for task_id, data in state.get("push_notification_infos", {}).items():
+                self._apply({"op": "push", "id": task_id, "data": data})
+
+        if not self.log_path.exists():
+            return 0
+
+        records = 0
+        valid_bytes = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    self._apply(json.loads(line))
+                except ValueError:
+                    # A torn write from a crash mid-append; everything before
+                    # it was acknowledged, everything after it was not.
+                    logger.warning(f"Discarding torn record at offset {valid_bytes} of {self.log_path}")
+                    break
+                valid_bytes += len(line)
+                records += 1
+
+        if valid_bytes != self.log_path.stat().st_size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+        logger.info(f"Recovered {len(self.tasks)} tasks from {self.directory} ({records} log records)")
+        return records
+
+    def _apply(self, record: dict) -> None:
+        op = record["op"]
+        if op == "task":
+            task = Task.model_validate(record["data"])
+            self.tasks[task.id] = task
+        elif op == "delete":
+            self.tasks.pop(record["id"], None)
+            self.push_notification_infos.pop(record["id"], None)
+        elif op == "push":
+            self.push_notification_infos[record["id"]] = (
+                PushNotificationConfig.model_validate(record["data"])
+            )
+        else:
+            raise ValueError(f"Unknown log record op {op}")
+
+    def _append(self, record: dict) -> None:
+        if not self._pending:
+            self._commit = asyncio.get_running_loop().create_future()
+        self._pending.append(json.dumps(record) + "\n")
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending())
+
+    async def _flush_pending(self) -> None:
+        while self._pending:
+            if self.commit_interval > 0:
+                await asyncio.sleep(self.commit_interval)
+
+            batch, self._pending = self._pending, []
+            committed = self._commit
+            try:
+                async with self._io_lock:
+                    await asyncio.to_thread(self._write_log, "".join(batch))
+            except Exception as e:
+                logger.error(f"Error while writing task log: {e}")
+                committed.set_exception(e)
+                # Retrieved here so a batch nobody waits on does not log twice.
+                committed.exception()
+                continue
+
+            committed.set_result(None)
+            self._log_records += len(batch)
+            if self._log_records >= self.snapshot_every:
+                await self.compact()
+
+    def _write_log(self, data: str) -> None:
+        self._log.write(data)
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+    def _write_snapshot(self, state: str) -> None:
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(state)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Only records after the snapshot are needed for replay now.
+        self._log.truncate(0)
+        self._log.seek(0)
+
+
+class SQLiteTaskStore(TaskStore):
+    """Store backed by an SQLite database in WAL mode, shared by worker processes.
+
+    Every read goes to the database so a task written by one worker is visible
+    to all others; parsed tasks are cached per process and only re-parsed when
+    their row version changes. Versions are clock-based rather than counters so
+    a deleted and recreated task never reuses one. Event ids come from an
+    AUTOINCREMENT column, so they are ordered across workers and survive
+    restarts. Task locks are process-local, so ``save_task`` only writes the
+    row if its version is still the one last read here, and raises
+    StaleTaskError when another worker got there first.
+    """
+
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS push_notification_infos (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS task_events (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS task_events_task_id ON task_events (task_id, event_id);
+    """
+
+    EVENT_TYPES = {
+        "status": TaskStatusUpdateEvent,
+        "artifact": TaskArtifactUpdateEvent,
+    }
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        event_buffer_size: int = 256,
+        busy_timeout: float = 5.0,
+    ):
+        self.path = str(path)
+        self.event_buffer_size = event_buffer_size
+        self.busy_timeout = busy_timeout
+        self.tasks: dict[str, Task] = {}
+        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+        self._task_versions: dict[str, int] = {}
+        # Tasks whose last get_task found no push config. The next
+        # get_push_notification_info trusts that once instead of querying,
+        # so updating a task without one costs no extra round trip.
+        self._no_push_config: set[str] = set()
+        self._conn: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pid: int | None = None
+
+    async def get_task(self, task_id: str) -> Task | None:
+        row = await self._run(self._select_task, task_id, self._task_versions.get(task_id, -1))
+        if row is None:
+            self._forget_task(task_id)
+            return None
+
+        version, data, has_push_config = row
+        if has_push_config:
+            self._no_push_config.discard(task_id)
+        else:
+            self._no_push_config.add(task_id)
+        if data is not None:
+            self.tasks[task_id] = Task.model_validate_json(data)
+            self._task_versions[task_id] = version
+        return self.tasks[task_id]
+
+    async def save_task(self, task: Task) -> None:
+        data = task.model_dump_json(exclude_none=True)
+        version = time.time_ns()
+        expected = self._task_versions.get(task.id)
+        try:
+            saved = await self._run(self._write_task, task.id, expected, version, data)
+        except BaseException:
+            # The write may or may not have landed; re-read the task next time.
+            self._forget_task(task.id)
+            raise
+        if not saved:
+            # Forget the cached copy so the retry re-reads the winner's write.
+            self._forget_task(task.id)
+            raise StaleTaskError(f"Task {task.id} was modified by another writer")
+        self.tasks[task.id] = task
+        self._task_versions[task.id] = version
+
+    async def delete_task(self, task_id: str) -> None:
+        await self._run(self._delete_task, task_id)
+        self._forget_task(task_id)
+        self.push_notification_infos.pop(task_id, None)
+        self._no_push_config.discard(task_id)
+
+    def get_task_version(self, task_id: str) -> int | None:
+        return self._task_versions.get(task_id)
+
+    def _forget_task(self, task_id: str):
+        self.tasks.pop(task_id, None)
+        self._task_versions.pop(task_id, None)
+
+    def stored_task_states(self) -> dict[str, TaskState]:
+        # Runs before the server starts, so a short-lived connection on the
+        # calling thread is fine.
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+        try:
+            conn.executescript(self.SCHEMA)
+            rows = conn.execute(
+                "SELECT id, json_extract(data, '$.status.state') FROM tasks ORDER BY rowid"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {task_id: TaskState(state) for task_id, state in rows}
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        if task_id in self._no_push_config:
+            self._no_push_config.discard(task_id)
+            self.push_notification_infos.pop(task_id, None)
+            return None
+        data = await self._run(self._select_push_notification_info, task_id)
+        if data is None:
+            self.push_notification_infos.pop(task_id, None)
+            return None
+
+        notification_config = PushNotificationConfig.model_validate_json(data)
+        self.push_notification_infos[task_id] = notification_config
+        return notification_config
+
+    async def save_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        data = notification_config.model_dump_json(exclude_none=True)
+        await self._run(self._upsert_push_notification_info, task_id, data)
+        self.push_notification_infos[task_id] = notification_config
+        self._no_push_config.discard(task_id)
+
+    async def append_event(self, task_id: str, event: Any) -> int:
+        kind = "status" if isinstance(event, TaskStatusUpdateEvent) else "artifact"
+        return await self._run(
+            self._insert_event, task_id, kind, event.model_dump_json(exclude_none=True)
+        )
+
+    async def get_events(
+        self, task_id: str, after_event_id: int | None = None
+    ) -> list[tuple[int, Any]]:
+        rows = await self._run(self._select_events, task_id, after_event_id or 0)
+        return [
+            (event_id, self.EVENT_TYPES[kind].model_validate_json(data))
+            for event_id, kind, data in rows
+        ]
+
+    async def close(self) -> None:
+        if self._executor is None or self._pid != os.getpid():
+            return
+        await self._run(self._close_connection)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def _run(self, fn, *args):
+        # Threads and SQLite connections do not survive fork(), so each worker
+        # process lazily gets its own executor and connection.
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sqlite-task-store"
+            )
+            self._conn = None
+            self._pid = os.getpid()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _select_task(self, task_id: str, known_version: int):
+        # Skip transferring the body when the cached copy is current.
+        return self._connection().execute(
+            "SELECT version, CASE WHEN version = ? THEN NULL ELSE data END,"
+            " EXISTS (SELECT 1 FROM push_notification_infos WHERE id = ?)"
+            " FROM tasks WHERE id = ?",
+            (known_version, task_id, task_id),
+        ).fetchone()
+
+    def _write_task(
+        self, task_id: str, expected: int | None, version: int, data: str
+    ) -> bool:
+        # Compare-and-set on the version: a task not read before must not
+        # exist yet, one read before must still be at the version read.
+        if expected is None:
+            cursor = self._connection().execute(
+                "INSERT INTO tasks (id, version, data) VALUES (?, ?, ?)"
+                " ON CONFLICT (id) DO NOTHING",
+                (task_id, version, data),
+            )
+        else:
+            cursor = self._connection().execute(
+                "UPDATE tasks SET data = ?, version = ? WHERE id = ? AND version = ?",
+                (data, version, task_id, expected),
+            )
+        return cursor.rowcount == 1
+
+    def _delete_task(self, task_id: str) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            conn.execute("DELETE FROM push_notification_infos WHERE id = ?", (task_id,))
+            conn.execute("DELETE FROM task_events WHERE task_id = ?", (task_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _select_push_notification_info(self, task_id: str) -> str | None:
+        row = self._connection().execute(
+            "SELECT data FROM push_notification_infos WHERE id = ?", (task_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _upsert_push_notification_info(self, task_id: str, data: str) -> None:
+        self._connection().execute(
+            "INSERT INTO push_notification_infos (id, data) VALUES (?, ?)"
+            " ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+            (task_id, data),
+        )
+
+    def _insert_event(self, task_id: str, kind: str, data: str) -> int:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            event_id = conn.execute(
+                "INSERT INTO task_events (task_id, kind, data) VALUES (?, ?, ?)",
+                (task_id, kind, data),
+            ).lastrowid
+            # Keep only the newest event_buffer_size events for the task.
+            conn.execute(
+                "DELETE FROM task_events WHERE task_id = ? AND event_id <= ("
+                " SELECT event_id FROM task_events WHERE task_id = ?"
+                " ORDER BY event_id DESC LIMIT 1 OFFSET ?)",
+                (task_id, task_id, self.event_buffer_size),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return event_id
+
+    def _select_events(self, task_id: str, after_event_id: int) -> list[tuple]:
+        return self._connection().execute(
+            "SELECT event_id, kind, data FROM task_events"
+            " WHERE task_id = ? AND event_id > ? ORDER BY event_id",
+            (task_id, after_event_id),
+        ).fetchall()
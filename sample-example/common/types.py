@@ -1,13 +1,19 @@
 from typing import Union, Any
-from pydantic import BaseModel, Field, TypeAdapter
+from pydantic import BaseModel, Field, TypeAdapter, VERSION as PYDANTIC_VERSION
 from typing import Literal, List, Annotated, Optional
 from datetime import datetime
-from pydantic import model_validator, ConfigDict, field_serializer
+from pydantic import model_validator, ConfigDict, field_serializer, PrivateAttr
 from uuid import uuid4
 from enum import Enum
 from typing_extensions import Self
 
 
+class _DeferredModel(BaseModel):
+    # Core schemas are built on first use instead of at import, so importing
+    # this module only collects fields. Subclasses inherit the setting.
+    model_config = ConfigDict(defer_build=True)
+
+
 class TaskState(str, Enum):
     SUBMITTED = "submitted"
     WORKING = "working"
@@ -18,13 +24,13 @@ class TaskState(str, Enum):
     UNKNOWN = "unknown"
 
 
-class TextPart(BaseModel):
+class TextPart(_DeferredModel):
     type: Literal["text"] = "text"
     text: str
     metadata: dict[str, Any] | None = None
 
 
-class FileContent(BaseModel):
+class FileContent(_DeferredModel):
     name: str | None = None
     mimeType: str | None = None
     bytes: str | None = None
@@ -41,13 +47,13 @@ class FileContent(BaseModel):
         return self
 
 
-class FilePart(BaseModel):
+class FilePart(_DeferredModel):
     type: Literal["file"] = "file"
     file: FileContent
     metadata: dict[str, Any] | None = None
 
 
-class DataPart(BaseModel):
+class DataPart(_DeferredModel):
     type: Literal["data"] = "data"
     data: dict[str, Any]
     metadata: dict[str, Any] | None = None
@@ -56,13 +62,13 @@ class DataPart(BaseModel):
 Part = Annotated[Union[TextPart, FilePart, DataPart], Field(discriminator="type")]
 
 
-class Message(BaseModel):
+class Message(_DeferredModel):
     role: Literal["user", "agent"]
     parts: List[Part]
     metadata: dict[str, Any] | None = None
 
 
-class TaskStatus(BaseModel):
+class TaskStatus(_DeferredModel):
     state: TaskState
     message: Message | None = None
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -72,7 +78,7 @@ class TaskStatus(BaseModel):
         return dt.isoformat()
 
 
-class Artifact(BaseModel):
+class Artifact(_DeferredModel):
     name: str | None = None
     description: str | None = None
     parts: List[Part]
@@ -82,7 +88,7 @@ class Artifact(BaseModel):
     lastChunk: bool | None = None
 
 
-class Task(BaseModel):
+class Task(_DeferredModel):
     id: str
     sessionId: str | None = None
     status: TaskStatus
@@ -91,42 +97,48 @@ class Task(BaseModel):
     metadata: dict[str, Any] | None = None
 
 
-class TaskStatusUpdateEvent(BaseModel):
+class TaskStatusUpdateEvent(_DeferredModel):
     id: str
     status: TaskStatus
     final: bool = False
     metadata: dict[str, Any] | None = None
 
 
-class TaskArtifactUpdateEvent(BaseModel):
+class TaskArtifactUpdateEvent(_DeferredModel):
     id: str
     artifact: Artifact    
     metadata: dict[str, Any] | None = None
 
 
-class AuthenticationInfo(BaseModel):
+class AuthenticationInfo(_DeferredModel):
     model_config = ConfigDict(extra="allow")
 
     schemes: List[str]
     credentials: str | None = None
 
 
-class PushNotificationConfig(BaseModel):
+class PushNotificationConfig(_DeferredModel):
     url: str
     token: str | None = None
     authentication: AuthenticationInfo | None = None
 
 
-class TaskIdParams(BaseModel):
+class TaskIdParams(_DeferredModel):
     id: str
     metadata: dict[str, Any] | None = None
 
 
 class TaskQueryParams(TaskIdParams):
     historyLength: int | None = None
+    # Long poll: hold tasks/get up to this many seconds for a state change.
+    waitSeconds: float | None = None
+
 
+class TaskResubscriptionParams(TaskIdParams):
+    lastEventId: int | None = None
 
-class TaskSendParams(BaseModel):
+
+class TaskSendParams(_DeferredModel):
     id: str
     sessionId: str = Field(default_factory=lambda: uuid4().hex)
     message: Message
@@ -136,7 +148,7 @@ class TaskSendParams(BaseModel):
     metadata: dict[str, Any] | None = None
 
 
-class TaskPushNotificationConfig(BaseModel):
+class TaskPushNotificationConfig(_DeferredModel):
     id: str
     pushNotificationConfig: PushNotificationConfig
 
@@ -144,7 +156,7 @@ class TaskPushNotificationConfig(BaseModel):
 ## RPC Messages
 
 
-class JSONRPCMessage(BaseModel):
+class JSONRPCMessage(_DeferredModel):
     jsonrpc: Literal["2.0"] = "2.0"
     id: int | str | None = Field(default_factory=lambda: uuid4().hex)
 
@@ -154,7 +166,7 @@ class JSONRPCRequest(JSONRPCMessage):
     params: dict[str, Any] | None = None
 
 
-class JSONRPCError(BaseModel):
+class JSONRPCError(_DeferredModel):
     code: int
     message: str
     data: Any | None = None
@@ -181,6 +193,8 @@ class SendTaskStreamingRequest(JSONRPCRequest):
 
 class SendTaskStreamingResponse(JSONRPCResponse):
     result: TaskStatusUpdateEvent | TaskArtifactUpdateEvent | None = None
+    # SSE event id used to resume streams; sent as the SSE "id" field, not in the body.
+    _event_id: int | None = PrivateAttr(default=None)
 
 
 class GetTaskRequest(JSONRPCRequest):
@@ -190,6 +204,10 @@ class GetTaskRequest(JSONRPCRequest):
 
 class GetTaskResponse(JSONRPCResponse):
     result: Task | None = None
+    # Pre-serialized result and its version tag, filled in by task managers
+    # that cache them; used by the server instead of re-encoding the task.
+    _result_json: bytes | None = PrivateAttr(default=None)
+    _etag: str | None = PrivateAttr(default=None)
 
 
 class CancelTaskRequest(JSONRPCRequest):
@@ -221,7 +239,7 @@ class GetTaskPushNotificationResponse(JSONRPCResponse):
 
 class TaskResubscriptionRequest(JSONRPCRequest):
     method: Literal["tasks/resubscribe",] = "tasks/resubscribe"
-    params: TaskIdParams
+    params: TaskResubscriptionParams
 
 
 A2ARequest = TypeAdapter(
@@ -236,7 +254,8 @@ A2ARequest = TypeAdapter(
             SendTaskStreamingRequest,
         ],
         Field(discriminator="method"),
-    ]
+    ],
+    config=ConfigDict(defer_build=True),
 )
 
 ## Error types
@@ -302,23 +321,25 @@ class ContentTypeNotSupportedError(JSONRPCError):
     data: None = None
 
 
-class AgentProvider(BaseModel):
+class AgentProvider(_DeferredModel):
     organization: str
     url: str | None = None
 
 
-class AgentCapabilities(BaseModel):
+class AgentCapabilities(_DeferredModel):
     streaming: bool = False
     pushNotifications: bool = False
     stateTransitionHistory: bool = False
+    # Server accepts JSON-RPC batch arrays (A2AServer does).
+    batchRequests: bool = False
 
 
-class AgentAuthentication(BaseModel):
+class AgentAuthentication(_DeferredModel):
     schemes: List[str]
     credentials: str | None = None
 
 
-class AgentSkill(BaseModel):
+class AgentSkill(_DeferredModel):
     id: str
     name: str
     description: str | None = None
@@ -328,7 +349,7 @@ class AgentSkill(BaseModel):
     outputModes: List[str] | None = None
 
 
-class AgentCard(BaseModel):
+class AgentCard(_DeferredModel):
     name: str
     description: str | None = None
     url: str
@@ -359,7 +380,114 @@ class A2AClientJSONError(A2AClientError):
         super().__init__(f"JSON Error: {message}")
 
 
+class A2AClientCircuitOpenError(A2AClientError):
+    def __init__(self, url: str, retry_after: float):
+        self.url = url
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {url}, retry in {retry_after:.1f}s")
+
+
 class MissingAPIKeyError(Exception):
     """Exception for missing API key."""
 
-    pass
\ No newline at end of file
+    pass
+
+## Trusted construction
+#
+# Server code wraps events that are already valid (built by the agent or read
+# from the store) in more models on every event. The trusted_* helpers skip
+# validation entirely: never pass them client input. model_construct would do
+# that too, but it re-derives defaults on every call and is slower than
+# validating small models; _trusted_builder works them out once per class.
+# Only the event and envelope models are covered: for leaf models such as
+# TaskStatus or TextPart, pydantic's validation is already as fast.
+#
+# The builder fills in an instance's slots the way pydantic 2's
+# model_construct does. Those slots are pydantic internals, so on any other
+# layout it falls back to model_construct itself.
+_MODEL_SLOTS = ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__")
+_FILL_SLOTS = PYDANTIC_VERSION.startswith("2.") and set(_MODEL_SLOTS) <= set(BaseModel.__slots__)
+
+
+def _trusted_builder(cls: type[BaseModel]):
+    fields = cls.model_fields
+    static = {}
+    factories = {}
+    for name, field in fields.items():
+        if field.default_factory is not None:
+            factories[name] = field.default_factory
+        elif not field.is_required():
+            static[name] = field.default
+    missing = object()
+
+    def is_set(name, value) -> bool:
+        # Like a validated instance built from only the non-default values,
+        # so model_dump(exclude_unset=True) matches too.
+        default = static.get(name, missing)
+        return value is not default and (default in (missing, None) or value != default)
+
+    if not _FILL_SLOTS or cls.model_config.get("extra") == "allow":
+        def construct(**values):
+            fields_set = {name for name, value in values.items() if is_set(name, value)}
+            return cls.model_construct(fields_set, **values)
+
+        return construct
+
+    private = {name: attr.get_default() for name, attr in cls.__private_attributes__.items()}
+    order = list(fields)
+    setattr_ = object.__setattr__
+
+    def build(**values):
+        obj = cls.__new__(cls)
+        fields_set = set()
+        data = {}
+        # Same key order as a validated instance, so dumps are identical.
+        for name in order:
+            if name in values:
+                value = data[name] = values[name]
+                # is_set, inlined: this runs for every streamed event.
+                default = static.get(name, missing)
+                if value is not default and (default in (missing, None) or value != default):
+                    fields_set.add(name)
+            elif name in factories:
+                data[name] = factories[name]()
+            else:
+                data[name] = static[name]
+        setattr_(obj, "__dict__", data)
+        setattr_(obj, "__pydantic_fields_set__", fields_set)
+        setattr_(obj, "__pydantic_extra__", None)
+        setattr_(obj, "__pydantic_private__", dict(private) if private else None)
+        return obj
+
+    return build
+
+
+_build_status_update = _trusted_builder(TaskStatusUpdateEvent)
+_build_artifact_update = _trusted_builder(TaskArtifactUpdateEvent)
+_build_streaming_response = _trusted_builder(SendTaskStreamingResponse)
+
+
+def trusted_status_update(
+    task_id: str, status: TaskStatus, final: bool = False, metadata: dict[str, Any] | None = None
+) -> TaskStatusUpdateEvent:
+    return _build_status_update(id=task_id, status=status, final=final, metadata=metadata)
+
+
+def trusted_artifact_update(
+    task_id: str, artifact: Artifact, metadata: dict[str, Any] | None = None
+) -> TaskArtifactUpdateEvent:
+    return _build_artifact_update(id=task_id, artifact=artifact, metadata=metadata)
+
+
+def trusted_streaming_response(
+    request_id: int | str | None,
+    result: TaskStatusUpdateEvent | TaskArtifactUpdateEvent | None = None,
+    error: JSONRPCError | None = None,
+) -> SendTaskStreamingResponse:
+    return _build_streaming_response(id=request_id, result=result, error=error)
+
+
+# Parses SSE events from raw JSON without the intermediate dict that
+# SendTaskStreamingResponse(**json.loads(...)) makes. Like the models and
+# A2ARequest, its schema is built on first use.
+SendTaskStreamingResponseAdapter = TypeAdapter(SendTaskStreamingResponse)
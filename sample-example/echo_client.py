@@ -4,7 +4,7 @@ import logging
 from uuid import uuid4
 
 # Assuming common types and client are importable
-from common.client import A2AClient, card_resolver # card_resolver might be needed
+from common.client import A2AClient, CachingCardResolver # resolver might be needed
 from common.types import Message, TextPart, AgentCard # Import AgentCard if needed directly
 
 # Configure basic logging
@@ -16,7 +16,8 @@ ECHO_SERVER_URL = "http://localhost:8001/a2a" # URL from Echo Server's AgentCard
 async def main():
     # In a real scenario, you might fetch the AgentCard first
     # try:
-    #   agent_card = await card_resolver.fetch_agent_card(ECHO_SERVER_URL)
+    #   async with CachingCardResolver() as resolver:
+    #       agent_card = await resolver.get_agent_card("http://localhost:8001")
     #   client = A2AClient(agent_card=agent_card)
     # except Exception as e:
     #   logger.error(f"Failed to fetch AgentCard or initialize client: {e}")
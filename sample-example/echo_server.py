@@ -27,7 +27,8 @@ ECHO_AGENT_CARD = AgentCard(
     capabilities=AgentCapabilities(
         streaming=False, # This simple agent won't stream
         pushNotifications=False,
-        stateTransitionHistory=False
+        stateTransitionHistory=False,
+        batchRequests=True
     ),
     authentication=None, # No auth for this simple example
     defaultInputModes=["text"],
@@ -28,7 +28,8 @@ STREAMING_ECHO_AGENT_CARD = AgentCard(
     capabilities=AgentCapabilities(
         streaming=True, # <<< Enable streaming capability
         pushNotifications=False,
-        stateTransitionHistory=True # Let's include history
+        stateTransitionHistory=True, # Let's include history
+        batchRequests=True
     ),
     authentication=None, # No auth for this simple example
     defaultInputModes=["text"],
@@ -49,9 +50,10 @@ STREAMING_ECHO_AGENT_CARD = AgentCard(
 
 # --- Task Management Logic (Implement on_send_task_subscribe) ---
 class StreamingEchoTaskManager(TaskManager):
-    def __init__(self):
+    def __init__(self, work_delay: float = 1.0):
         self.tasks: dict[str, Task] = {} # Store task state
         self.lock = asyncio.Lock()
+        self.work_delay = work_delay # Seconds of simulated work per step
         # NOTE: The common InMemoryTaskManager in samples handles SSE queueing
         #       If NOT using that base class, you'd need SSE queue management here.
         #       For this example, we'll simulate the async generator directly.
@@ -66,7 +68,7 @@ class StreamingEchoTaskManager(TaskManager):
             result=TaskStatusUpdateEvent(id=task_id, status=working_status)
         )
 
-        await asyncio.sleep(1) # Simulate work
+        await asyncio.sleep(self.work_delay) # Simulate work
 
         # 2. Simulate some progress (optional)
         progress_status = TaskStatus(state=TaskState.WORKING, message=Message(role="agent", parts=[TextPart(text="Thinking...")]))
@@ -75,7 +77,7 @@ class StreamingEchoTaskManager(TaskManager):
             result=TaskStatusUpdateEvent(id=task_id, status=progress_status)
         )
 
-        await asyncio.sleep(2) # Simulate more work
+        await asyncio.sleep(2 * self.work_delay) # Simulate more work
 
         # 3. Send 'completed' status update with final message
         agent_response_message = Message(
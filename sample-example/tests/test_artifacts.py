@@ -0,0 +1,41 @@
+from common.client.artifacts import ArtifactAssembler
+from common.types import Artifact, TaskArtifactUpdateEvent, TextPart
+
+
+def update(text: str, **fields) -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        id="t1", artifact=Artifact(parts=[TextPart(text=text)], **fields)
+    )
+
+
+def test_appended_chunks_are_joined_into_one_artifact():
+    assembler = ArtifactAssembler()
+    assert assembler.add(update("a", name="report")) == []
+    assert assembler.add(update("b", append=True)) == []
+    [artifact] = assembler.add(update("c", append=True, lastChunk=True))
+
+    assert artifact.name == "report"
+    assert [part.text for part in artifact.parts] == ["abc"]
+    assert assembler.flush() == []
+
+
+def test_non_append_chunk_keeps_the_artifact_it_replaces():
+    assembler = ArtifactAssembler()
+    assembler.add(update("a", name="report"))
+    assembler.add(update("b", append=True))
+    [report] = assembler.add(update("x", name="chart"))
+    assembler.add(update("y", append=True))
+
+    assert report.name == "report"
+    assert [part.text for part in report.parts] == ["ab"]
+    [chart] = assembler.flush()
+    assert chart.name == "chart"
+    assert [part.text for part in chart.parts] == ["xy"]
+
+
+def test_replaced_artifact_precedes_one_finished_by_the_same_chunk():
+    assembler = ArtifactAssembler()
+    assembler.add(update("a", name="report"))
+    finished = assembler.add(update("x", name="chart", lastChunk=True))
+
+    assert [artifact.name for artifact in finished] == ["report", "chart"]
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from common.server.file_store import DEFAULT_MAX_FILE_SIZE, FileStore, FileTooLargeError
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_concurrent_downloads_of_a_spilled_file_read_it_whole():
+    async def run():
+        store = FileStore(spool_max_memory=1024, chunk_size=1000)
+        data = bytes(range(256)) * 40
+        file_id = await store.save(chunks(data[:5000], data[5000:]), name="a.bin")
+        downloads = await asyncio.gather(
+            *(collect(store.read(file_id)) for _ in range(4))
+        )
+        store.close()
+        return data, downloads
+
+    async def collect(iterator):
+        return b"".join([chunk async for chunk in iterator])
+
+    data, downloads = asyncio.run(run())
+    assert downloads == [data] * 4
+
+
+def test_uploads_are_capped_by_default():
+    assert FileStore().max_file_size == DEFAULT_MAX_FILE_SIZE
+
+
+def test_oversized_uploads_are_refused_and_not_kept():
+    async def run():
+        store = FileStore(max_file_size=10)
+        with pytest.raises(FileTooLargeError):
+            await store.save(chunks(b"x" * 6, b"x" * 6))
+        return store
+
+    assert asyncio.run(run()).files == {}
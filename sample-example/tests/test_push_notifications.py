@@ -0,0 +1,211 @@
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+from common.server.push_notifications import PushNotificationSender
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import SQLiteTaskStore
+from common.types import (
+    Message,
+    PushNotificationConfig,
+    SetTaskPushNotificationRequest,
+    Task,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+WEBHOOK_URL = "http://receiver/webhook"
+
+
+class StubReceiver:
+    """Webhook receiver served in-process; answers with ``statuses`` in turn."""
+
+    def __init__(self, statuses: list[int] | None = None):
+        self.statuses = list(statuses or [])
+        self.received: list[dict] = []
+        self.attempts = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.app = Starlette()
+        self.app.add_route("/webhook", self._webhook, methods=["POST"])
+
+    async def _webhook(self, request: Request) -> Response:
+        self.attempts += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self.release.wait()
+            status = self.statuses.pop(0) if self.statuses else 200
+            if status == 200:
+                self.received.append(await request.json())
+            return Response(status_code=status)
+        finally:
+            self.in_flight -= 1
+
+    def sender(self, **kwargs) -> PushNotificationSender:
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app))
+        kwargs.setdefault("url_allowed", lambda url: url == WEBHOOK_URL)
+        return PushNotificationSender(http_client=http_client, **kwargs)
+
+
+class TaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def task(state: TaskState) -> Task:
+    return Task(id="t1", status=TaskStatus(state=state))
+
+
+def send_params(task_id: str) -> TaskSendParams:
+    return TaskSendParams(id=task_id, message=Message(role="user", parts=[TextPart(text="hi")]))
+
+
+def test_updates_queued_behind_a_delivery_are_coalesced_in_order():
+    async def run():
+        receiver = StubReceiver()
+        sender = receiver.sender()
+        config = PushNotificationConfig(url=WEBHOOK_URL)
+
+        receiver.release.clear()
+        sender.enqueue("t1", config, task(TaskState.SUBMITTED))
+        while receiver.in_flight == 0:
+            await asyncio.sleep(0)
+        for state in (TaskState.WORKING, TaskState.INPUT_REQUIRED, TaskState.COMPLETED):
+            sender.enqueue("t1", config, task(state))
+        receiver.release.set()
+        await sender.drain()
+        await sender.close()
+        return receiver, sender
+
+    receiver, sender = asyncio.run(run())
+    assert [body["status"]["state"] for body in receiver.received] == ["submitted", "completed"]
+    assert receiver.max_in_flight == 1
+    assert sender.stats["coalesced"] == 2
+    assert sender.stats["delivered"] == 2
+
+
+def test_server_errors_are_retried():
+    async def run():
+        receiver = StubReceiver(statuses=[503, 500])
+        sender = receiver.sender(initial_backoff=0.001)
+        sender.enqueue("t1", PushNotificationConfig(url=WEBHOOK_URL), task(TaskState.COMPLETED))
+        await sender.drain()
+        await sender.close()
+        return receiver, sender
+
+    receiver, sender = asyncio.run(run())
+    assert receiver.attempts == 3
+    assert len(receiver.received) == 1
+    assert sender.stats == {"delivered": 1, "failed": 0, "retries": 2, "coalesced": 0}
+
+
+def test_client_errors_are_not_retried():
+    async def run():
+        receiver = StubReceiver(statuses=[400])
+        sender = receiver.sender(initial_backoff=0.001)
+        sender.enqueue("t1", PushNotificationConfig(url=WEBHOOK_URL), task(TaskState.COMPLETED))
+        await sender.drain()
+        await sender.close()
+        return receiver, sender
+
+    receiver, sender = asyncio.run(run())
+    assert receiver.attempts == 1
+    assert sender.stats["failed"] == 1
+
+
+def test_disallowed_urls_are_rejected_and_never_delivered_to():
+    async def run():
+        receiver = StubReceiver()
+        sender = receiver.sender(url_allowed=lambda url: url.startswith("https://"))
+        manager = TaskManager(push_sender=sender)
+        await manager.upsert_task(send_params("t1"))
+        response = await manager.on_set_task_push_notification(
+            SetTaskPushNotificationRequest(
+                params={"id": "t1", "pushNotificationConfig": {"url": WEBHOOK_URL}}
+            )
+        )
+        # A config that reached the store some other way is still refused.
+        sender.enqueue("t1", PushNotificationConfig(url=WEBHOOK_URL), task(TaskState.COMPLETED))
+        await sender.drain()
+        await manager.close()
+        return receiver, sender, response
+
+    receiver, sender, response = asyncio.run(run())
+    assert response.error is not None and response.error.code == -32602
+    assert receiver.attempts == 0
+    assert sender.stats["failed"] == 1
+
+
+def test_no_url_is_allowed_without_a_policy():
+    async def run():
+        receiver = StubReceiver()
+        sender = receiver.sender(url_allowed=None)
+        sender.enqueue("t1", PushNotificationConfig(url=WEBHOOK_URL), task(TaskState.COMPLETED))
+        await sender.drain()
+        await sender.close()
+        return receiver, sender
+
+    receiver, sender = asyncio.run(run())
+    assert receiver.attempts == 0
+    assert sender.stats["failed"] == 1
+
+
+def test_configs_are_only_stored_without_a_sender():
+    async def run():
+        manager = TaskManager()
+        await manager.upsert_task(send_params("t1"))
+        response = await manager.on_set_task_push_notification(
+            SetTaskPushNotificationRequest(
+                params={"id": "t1", "pushNotificationConfig": {"url": WEBHOOK_URL}}
+            )
+        )
+        await manager.update_store("t1", TaskStatus(state=TaskState.COMPLETED), None)
+        await manager.close()
+        return manager, response
+
+    manager, response = asyncio.run(run())
+    assert response.error is None
+    assert manager.push_sender is None
+
+
+def test_shared_store_updates_deliver_without_extra_lookups(tmp_path):
+    async def run():
+        receiver = StubReceiver()
+        store = SQLiteTaskStore(tmp_path / "tasks.db")
+        lookups = 0
+        select = store._select_push_notification_info
+
+        def counted(task_id):
+            nonlocal lookups
+            lookups += 1
+            return select(task_id)
+
+        store._select_push_notification_info = counted
+        manager = TaskManager(task_store=store, push_sender=receiver.sender())
+        for task_id in ("plain", "pushed"):
+            await manager.upsert_task(send_params(task_id))
+        await manager.set_push_notification_info(
+            "pushed", PushNotificationConfig(url=WEBHOOK_URL)
+        )
+        for state in (TaskState.WORKING, TaskState.COMPLETED):
+            await manager.update_store("plain", TaskStatus(state=state), None)
+        plain_lookups = lookups
+        await manager.update_store("pushed", TaskStatus(state=TaskState.COMPLETED), None)
+        await manager.push_sender.drain()
+        await manager.close()
+        return receiver, plain_lookups
+
+    receiver, plain_lookups = asyncio.run(run())
+    assert plain_lookups == 0
+    assert [body["id"] for body in receiver.received] == ["pushed"]
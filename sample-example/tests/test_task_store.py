@@ -0,0 +1,96 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import SQLiteTaskStore
+from common.types import Message, TaskSendParams, TaskState, TaskStatus, TextPart
+
+
+class TaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def send_params(task_id: str) -> TaskSendParams:
+    return TaskSendParams(id=task_id, message=Message(role="user", parts=[TextPart(text="hi")]))
+
+
+def test_readers_do_not_see_a_write_before_it_is_saved(tmp_path):
+    async def run():
+        store = SQLiteTaskStore(tmp_path / "tasks.db")
+        manager = TaskManager(task_store=store, concurrency_mode="striped")
+        await manager.upsert_task(send_params("t1"))
+
+        write = store._write_task
+        saving = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_write(*args):
+            loop.call_soon_threadsafe(saving.set)
+            return write(*args)
+
+        store._write_task = slow_write
+        update = asyncio.create_task(
+            manager.update_store("t1", TaskStatus(state=TaskState.WORKING), None)
+        )
+        await saving.wait()
+        # What a reader gets back while the write is still in flight.
+        seen = store.tasks["t1"].status.state
+        await update
+        await manager.close()
+        return seen
+
+    assert asyncio.run(run()) == TaskState.SUBMITTED
+
+
+def test_a_failed_save_is_not_persisted_by_the_next_write(tmp_path):
+    async def run():
+        store = SQLiteTaskStore(tmp_path / "tasks.db")
+        manager = TaskManager(task_store=store)
+        await manager.upsert_task(send_params("t1"))
+
+        write = store._write_task
+
+        def failing_write(*args):
+            store._write_task = write
+            raise sqlite3.OperationalError("disk I/O error")
+
+        store._write_task = failing_write
+        with pytest.raises(sqlite3.OperationalError):
+            await manager.update_store(
+                "t1",
+                TaskStatus(state=TaskState.WORKING, message=Message(role="agent", parts=[TextPart(text="lost")])),
+                None,
+            )
+        await manager.update_store("t1", TaskStatus(state=TaskState.COMPLETED), None)
+        await manager.close()
+
+        reopened = SQLiteTaskStore(tmp_path / "tasks.db")
+        task = await reopened.get_task("t1")
+        await reopened.close()
+        return task
+
+    task = asyncio.run(run())
+    assert task.status.state == TaskState.COMPLETED
+    assert [part.text for message in task.history for part in message.parts] == ["hi"]
+
+
+def test_close_cancels_event_followers(tmp_path):
+    async def run():
+        store = SQLiteTaskStore(tmp_path / "tasks.db")
+        manager = TaskManager(task_store=store)
+        await manager.upsert_task(send_params("t1"))
+        await manager.setup_sse_consumer("t1")
+        followers = set(manager._follower_tasks)
+        await manager.close()
+        return followers, manager
+
+    followers, manager = asyncio.run(run())
+    assert len(followers) == 1
+    assert all(follower.cancelled() for follower in followers)
+    assert not manager._follower_tasks and not manager._event_followers
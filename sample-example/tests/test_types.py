@@ -0,0 +1,48 @@
+import pytest
+
+from common import types
+from common.types import (
+    Artifact,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+    trusted_artifact_update,
+    trusted_status_update,
+    trusted_streaming_response,
+)
+
+STATUS = TaskStatus(state=TaskState.WORKING)
+ARTIFACT = Artifact(parts=[TextPart(text="chunk")])
+
+
+def trusted_and_validated():
+    event = TaskStatusUpdateEvent(id="t1", status=STATUS)
+    return [
+        (trusted_status_update("t1", STATUS), event),
+        (
+            trusted_status_update("t1", STATUS, final=True),
+            TaskStatusUpdateEvent(id="t1", status=STATUS, final=True),
+        ),
+        (trusted_artifact_update("t1", ARTIFACT), TaskArtifactUpdateEvent(id="t1", artifact=ARTIFACT)),
+        (trusted_streaming_response(1, result=event), SendTaskStreamingResponse(id=1, result=event)),
+    ]
+
+
+@pytest.mark.parametrize("fill_slots", [True, False])
+def test_trusted_models_match_validated_ones(monkeypatch, fill_slots):
+    monkeypatch.setattr(types, "_FILL_SLOTS", fill_slots)
+    for name, model in [
+        ("_build_status_update", TaskStatusUpdateEvent),
+        ("_build_artifact_update", TaskArtifactUpdateEvent),
+        ("_build_streaming_response", SendTaskStreamingResponse),
+    ]:
+        monkeypatch.setattr(types, name, types._trusted_builder(model))
+
+    for trusted, validated in trusted_and_validated():
+        assert trusted.model_dump_json() == validated.model_dump_json()
+        assert trusted.model_fields_set == validated.model_fields_set
+        assert trusted.model_dump(exclude_unset=True) == validated.model_dump(exclude_unset=True)
+        assert trusted == validated
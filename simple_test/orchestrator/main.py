@@ -3,8 +3,19 @@ import requests
 import uuid
 import os
 
+import tracing
+
 app = FastAPI()
 
+# Spans go to $A2A_TRACE_FILE (OTLP/JSON lines) when it is set.
+tracing.configure(service_name="orchestrator")
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """Continue the caller's trace (traceparent header) for every request."""
+    with tracing.server_span(f"{request.method} {request.url.path}", request.headers):
+        return await call_next(request)
+
 # Get remote agent URLs from environment variables or use defaults
 MATH_AGENT_URL = os.environ.get("MATH_AGENT_URL", "http://localhost:8001")
 TRANSLATOR_AGENT_URL = os.environ.get("TRANSLATOR_AGENT_URL", "http://localhost:8002")
@@ -103,7 +114,15 @@ async def handle_task(request: Request):
     }
     try:
         # Send the task to the remote agent (synchronous call using HTTP POST).
-        resp = requests.post(f"{target_agent_url}/tasks/send", json=forward_payload)
+        # The traceparent header carries the trace on to the remote agent.
+        forward_url = f"{target_agent_url}/tasks/send"
+        with tracing.span(
+            f"POST {forward_url}",
+            tracing.SpanKind.CLIENT,
+            {"url.full": forward_url, "a2a.skill": skill_used},
+        ) as span:
+            resp = requests.post(forward_url, json=forward_payload, headers=tracing.inject())
+            span.set_attribute("http.response.status_code", resp.status_code)
     except Exception as e:
         return {"error": f"Failed to reach agent: {e}"}, 500
 
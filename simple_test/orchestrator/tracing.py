@@ -0,0 +1,357 @@
+"""Distributed tracing with W3C ``traceparent`` propagation.
+
+Spans are written to a local file as OTLP/JSON, one ExportTraceServiceRequest
+per line (the OpenTelemetry Collector file exporter format), so traces from
+every service can be merged and loaded into any OTLP-aware tool. Tracing is
+off unless ``A2A_TRACE_FILE`` is set or ``configure`` is called; while it is
+off every function here is a cheap no-op.
+"""
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Mapping, NamedTuple
+import atexit
+import json
+import os
+import secrets
+import threading
+import time
+
+TRACEPARENT_HEADER = "traceparent"
+
+
+class SpanKind(IntEnum):
+    # Values of the OTLP Span.SpanKind enum.
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+
+
+class Span:
+    __slots__ = (
+        "name", "kind", "context", "parent_span_id", "attributes",
+        "start_ns", "end_ns", "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: SpanKind,
+        context: SpanContext,
+        parent_span_id: str | None,
+        attributes: dict[str, Any] | None,
+    ):
+        self.name = name
+        self.kind = kind
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if _exporter is not None:
+                _exporter.export(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    context = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class FileSpanExporter:
+    """Appends finished spans to ``path`` in batches from a background thread.
+
+    The thread writes a batch once it holds ``batch_size`` spans, and every
+    ``flush_interval`` seconds while spans are waiting, so the request path
+    never touches the file and an idle process still exports promptly.
+    ``flush`` writes whatever is left; it runs at exit and when an A2AServer
+    (or one of its forked workers) shuts down.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str,
+        batch_size: int = 128,
+        flush_interval: float = 1.0,
+    ):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+        # Held while writing, so a flush returns only once earlier batches
+        # are in the file.
+        self._write_lock = threading.Lock()
+        self._batch_full = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            full = len(self._spans) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="a2a-span-exporter", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._batch_full.set()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                spans, self._spans = self._spans, []
+            if spans:
+                self._write(spans)
+
+    def close(self):
+        self._closed = True
+        self._batch_full.set()
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._batch_full.wait(self.flush_interval)
+            self._batch_full.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Tracing must never take the service down; keep exporting.
+                pass
+
+    def _after_fork_in_child(self):
+        # The parent exports the spans it had buffered, and neither the
+        # thread nor a lock it held survives fork: start over.
+        self._spans = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._batch_full = threading.Event()
+        self._thread = None
+
+    def _write(self, spans: list[Span]):
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", self.service_name)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "a2a"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        # One write per batch on an O_APPEND file, so several processes can
+        # share a trace file without interleaving lines.
+        with open(self.path, "a") as f:
+            f.write(line)
+
+
+_exporter: FileSpanExporter | None = None
+_current_span: ContextVar[Span | None] = ContextVar("a2a_current_span", default=None)
+
+
+def configure(service_name: str | None = None, path: str | None = None):
+    """Start exporting spans to ``path`` (default: ``$A2A_TRACE_FILE``).
+
+    Without a path tracing is turned off.
+    """
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+    path = path or os.environ.get("A2A_TRACE_FILE")
+    if not path:
+        _exporter = None
+        return
+    service_name = service_name or os.environ.get("OTEL_SERVICE_NAME", "a2a")
+    _exporter = FileSpanExporter(path, service_name)
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def flush():
+    if _exporter is not None:
+        _exporter.flush()
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: dict[str, Any] | None = None,
+    parent: SpanContext | None = None,
+) -> Span | _NoopSpan:
+    """Start a span without making it current; call ``end()`` when done.
+
+    The parent defaults to the current span; with neither, a new trace starts.
+    """
+    if _exporter is None:
+        return NOOP_SPAN
+    if parent is None:
+        current = _current_span.get()
+        if current is not None:
+            parent = current.context
+    trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+    context = SpanContext(trace_id, secrets.token_hex(8))
+    return Span(name, kind, context, parent.span_id if parent else None, attributes)
+
+
+class _SpanScope:
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.span.record_error(exc)
+        _current_span.reset(self.token)
+        self.span.end()
+        return False
+
+
+class _NoopScope:
+    def __enter__(self) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+def span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: dict[str, Any] | None = None,
+    parent: SpanContext | None = None,
+):
+    """Context manager running its block inside a new current span.
+
+    Not for async generators: their body may resume in another context.
+    """
+    if _exporter is None:
+        return _NOOP_SCOPE
+    return _SpanScope(start_span(name, kind, attributes, parent))
+
+
+def server_span(
+    name: str, headers: Mapping[str, str], attributes: dict[str, Any] | None = None
+):
+    """A SERVER span continuing the trace of an incoming request, if any."""
+    if _exporter is None:
+        return _NOOP_SCOPE
+    return span(name, SpanKind.SERVER, attributes, extract(headers))
+
+
+def inject(
+    headers: dict[str, str] | None = None, span: Span | _NoopSpan | None = None
+) -> dict[str, str] | None:
+    """Return ``headers`` plus the traceparent of ``span`` or the current span."""
+    if _exporter is None:
+        return headers
+    context = (span or _current_span.get() or NOOP_SPAN).context
+    if context is None:
+        return headers
+    return {
+        **(headers or {}),
+        TRACEPARENT_HEADER: f"00-{context.trace_id}-{context.span_id}-01",
+    }
+
+
+def extract(headers: Mapping[str, str]) -> SpanContext | None:
+    """Parse a W3C traceparent header; None when absent or malformed."""
+    value = headers.get(TRACEPARENT_HEADER)
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id)
+
+
+def _after_fork_in_child():
+    if _exporter is not None:
+        _exporter._after_fork_in_child()
+
+
+atexit.register(flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+configure()
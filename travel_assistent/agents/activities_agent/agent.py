@@ -1,32 +1,42 @@
-from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+import functools
 import json
 
-activities_agent = Agent(
-    name="activities_agent",
-    model=LiteLlm("openai/gpt-4o"),
-    description="Suggests interesting activities for the user at a destination.",
-    instruction=(
-        "Given a destination, dates, and budget, suggest 2-3 engaging tourist or cultural activities. "
-        "For each activity, provide name, a short description, price estimate, and duration in hours. "
-        "Respond in plain English (not JSON). Keep it concise and well-formatted."
+
+@functools.cache
+def get_runner():
+    # google.adk and LiteLlm take seconds to import, so the agent and its
+    # runner are built on the first request rather than at server startup.
+    from google.adk.agents import Agent
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+    activities_agent = Agent(
+        name="activities_agent",
+        model=LiteLlm("openai/gpt-4o"),
+        description="Suggests interesting activities for the user at a destination.",
+        instruction=(
+            "Given a destination, dates, and budget, suggest 2-3 engaging tourist or cultural activities. "
+            "For each activity, provide name, a short description, price estimate, and duration in hours. "
+            "Respond in plain English (not JSON). Keep it concise and well-formatted."
+        )
     )
-)
 
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=activities_agent,
-    app_name="activities_app",
-    session_service=session_service
-)
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=activities_agent,
+        app_name="activities_app",
+        session_service=session_service
+    )
+    return runner, session_service
 
 USER_ID = "user_activities"
 SESSION_ID = "session_activities"
 
 async def execute(request):
+    from google.genai import types
+
+    runner, session_service = get_runner()
     session_service.create_session(
         app_name="activities_app",
         user_id=USER_ID,
@@ -1,30 +1,40 @@
-from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-
-flight_agent = Agent(
-    name="flight_agent",
-    model=LiteLlm("openai/gpt-4o"),
-    description="Suggests flight options for a destination.",
-    instruction=(
-        "Given a destination, travel dates, and budget, suggest 1-2 realistic flight options. "
-        "Include airline name, price, and departure time. Ensure flights fit within the budget."
+import functools
+
+
+@functools.cache
+def get_runner():
+    # google.adk and LiteLlm take seconds to import, so the agent and its
+    # runner are built on the first request rather than at server startup.
+    from google.adk.agents import Agent
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+    flight_agent = Agent(
+        name="flight_agent",
+        model=LiteLlm("openai/gpt-4o"),
+        description="Suggests flight options for a destination.",
+        instruction=(
+            "Given a destination, travel dates, and budget, suggest 1-2 realistic flight options. "
+            "Include airline name, price, and departure time. Ensure flights fit within the budget."
+        )
     )
-)
 
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=flight_agent,
-    app_name="flight_app",
-    session_service=session_service
-)
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=flight_agent,
+        app_name="flight_app",
+        session_service=session_service
+    )
+    return runner, session_service
 
 USER_ID = "user_1"
 SESSION_ID = "session_001"
 
 async def execute(request):
+    from google.genai import types
+
+    runner, session_service = get_runner()
     # 🔧 Ensure session is created before running the agent
     session_service.create_session(
         app_name="flight_app",
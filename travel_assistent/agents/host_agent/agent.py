@@ -1,28 +1,38 @@
-from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-
-host_agent = Agent(
-    name="host_agent",
-    model=LiteLlm("openai/gpt-4o"),
-    description="Coordinates travel planning by calling flight, stay, and activity agents.",
-    instruction="You are the host agent responsible for orchestrating trip planning tasks. "
-                "You call external agents to gather flights, stays, and activities, then return a final result."
-)
-
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=host_agent,
-    app_name="host_app",
-    session_service=session_service
-)
+import functools
+
+
+@functools.cache
+def get_runner():
+    # google.adk and LiteLlm take seconds to import, so the agent and its
+    # runner are built on the first request rather than at server startup.
+    from google.adk.agents import Agent
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+    host_agent = Agent(
+        name="host_agent",
+        model=LiteLlm("openai/gpt-4o"),
+        description="Coordinates travel planning by calling flight, stay, and activity agents.",
+        instruction="You are the host agent responsible for orchestrating trip planning tasks. "
+                    "You call external agents to gather flights, stays, and activities, then return a final result."
+    )
+
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=host_agent,
+        app_name="host_app",
+        session_service=session_service
+    )
+    return runner, session_service
 
 USER_ID = "user_host"
 SESSION_ID = "session_host"
 
 async def execute(request):
+    from google.genai import types
+
+    runner, session_service = get_runner()
     # Ensure session exists
     session_service.create_session(
         app_name="host_app",
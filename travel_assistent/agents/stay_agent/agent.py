@@ -1,30 +1,40 @@
-from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-
-stay_agent = Agent(
-    name="stay_agent",
-    model=LiteLlm("openai/gpt-4o"),
-    description="Suggests hotel or stay options for a destination.",
-    instruction=(
-        "Given a destination, travel dates, and budget, suggest 2-3 hotel or stay options. "
-        "Include hotel name, price per night, and location. Ensure suggestions are within budget."
+import functools
+
+
+@functools.cache
+def get_runner():
+    # google.adk and LiteLlm take seconds to import, so the agent and its
+    # runner are built on the first request rather than at server startup.
+    from google.adk.agents import Agent
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+    stay_agent = Agent(
+        name="stay_agent",
+        model=LiteLlm("openai/gpt-4o"),
+        description="Suggests hotel or stay options for a destination.",
+        instruction=(
+            "Given a destination, travel dates, and budget, suggest 2-3 hotel or stay options. "
+            "Include hotel name, price per night, and location. Ensure suggestions are within budget."
+        )
     )
-)
 
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=stay_agent,
-    app_name="stay_app",
-    session_service=session_service
-)
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=stay_agent,
+        app_name="stay_app",
+        session_service=session_service
+    )
+    return runner, session_service
 
 USER_ID = "user_stay"
 SESSION_ID = "session_stay"
 
 async def execute(request):
+    from google.genai import types
+
+    runner, session_service = get_runner()
     session_service.create_session(
         app_name="stay_app",
         user_id=USER_ID,
@@ -1,8 +1,12 @@
 import httpx
 
-async def call_agent(url, payload):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, timeout=60.0)
-        response.raise_for_status()
-        return response.json()
+from common import tracing
 
+async def call_agent(url, payload):
+    # The traceparent header lets the downstream agent's spans join this trace.
+    with tracing.span(f"POST {url}", tracing.SpanKind.CLIENT, {"url.full": url}) as span:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(url, json=payload, timeout=60.0, headers=tracing.inject())
+            span.set_attribute("http.response.status_code", response.status_code)
+            response.raise_for_status()
+            return response.json()
@@ -1,11 +1,21 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 import uvicorn
 
-def create_app(agent):
+from common import tracing
+
+def create_app(agent, name=None):
+    # Spans go to $A2A_TRACE_FILE when it is set; name labels this agent's spans.
+    tracing.configure(service_name=name)
     app = FastAPI()
 
+    @app.middleware("http")
+    async def trace_request(request: Request, call_next):
+        with tracing.server_span(f"{request.method} {request.url.path}", request.headers):
+            return await call_next(request)
+
     @app.post("/run")
     async def run(payload: dict):
-        return await agent.execute(payload)
+        with tracing.span("agent.execute"):
+            return await agent.execute(payload)
 
-    return app
\ No newline at end of file
+    return app